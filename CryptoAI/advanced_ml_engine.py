@@ -12,59 +12,296 @@ import tensorflow as tf  # type: ignore[import-not-found]
 from tensorflow import keras  # type: ignore[import-not-found]
 from sklearn.preprocessing import MinMaxScaler
 from datetime import datetime
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import logging
+import math
+import multiprocessing
+import os
+import tempfile
 import threading
 import time
 
+logger = logging.getLogger(__name__)
+
+
+def _retrain_worker(config, weights_dir, state, historical_data, aggressive):
+    """
+    Retrain the ensemble in a worker process with its own TF runtime
+
+    Starts from the weights the parent saved in weights_dir (if any) and
+    writes the retrained weights back there.
+
+    Returns:
+        Tuple of (training result dict, engine state for the parent)
+    """
+    engine = AdvancedMLEngine(**config)
+    engine._apply_state(state)
+    if engine._has_saved_weights(weights_dir):
+        engine._build_models((engine.lookback, 2))
+        engine._load_weights(weights_dir)
+
+    result = engine.train_models(historical_data, aggressive)
+    if result.get('success'):
+        engine._save_weights(weights_dir)
+    return result, engine._export_state()
+
 
 class AdvancedMLEngine:
     """
     Advanced ML engine with aggressive real-time training
     """
     
-    def __init__(self, lookback=60, prediction_horizon=24):
+    def __init__(self, lookback=60, prediction_horizon=24, use_int8=False):
         """
         Initialize advanced ML engine
         
         Args:
             lookback: Number of timesteps to look back
             prediction_horizon: Hours ahead to predict
+            use_int8: Serve GRU/attention predictions from INT8 TFLite models (CPU)
         """
+        # Mixed precision only pays off on tensor-core GPUs; on CPU it is slower
+        if tf.config.list_physical_devices('GPU'):
+            keras.mixed_precision.set_global_policy('mixed_float16')
+
         self.lookback = lookback
         self.prediction_horizon = prediction_horizon
+        self.use_int8 = use_int8
         self.scaler = MinMaxScaler(feature_range=(0, 1))
+
+        # Close-price inverse transform, cached as price = x * scale + min
+        self._price_scale = None
+        self._price_min = None
+
+        # Streaming min/max behind the scaler, and the last timestamp folded in
+        self._running_min = None
+        self._running_max = None
+        self._last_seen = None
         
         # Model components
         self.seq2seq_vae_model = None
+        self.vae_student = None  # Distilled stand-in for the VAE at inference
         self.bidirectional_gru = None
         self.attention_model = None
+
+        # Traced single-sample inference functions (built after training)
+        self._fused_infer = None
+        self._vae_infer = None
+
+        # Post-training INT8 TFLite models, keyed by ensemble member
+        self._tflite_content = {}
+        self._tflite_models = {}
         
         # Ensemble weights (learned dynamically)
-        self.model_weights = {'seq2seq_vae': 0.4, 'bigru': 0.35, 'attention': 0.25}
+        self._set_model_weights({'seq2seq_vae': 0.4, 'bigru': 0.35, 'attention': 0.25})
+
+        # Optimizer steps per epoch, fixed when the models are first built
+        self._steps_per_epoch = None
+
+        # Reused (3, horizon) buffer of per-model predictions
+        self._pred_buf = None
+        self._predict_lock = threading.Lock()
         
         # Online learning parameters
         self.retrain_threshold = 0.05  # Retrain if accuracy drops 5%
         self.last_accuracy = 0.0
         self.training_lock = threading.Lock()
         self.is_training = False
+
+        # Background retraining runs in its own process (isolated GIL + TF pools);
+        # the pool is started on the first retrain, so worker engines never get one
+        self._retrain_pool = None
+        self._retrain_future = None
+        self._weights_dir = None
         
-        # Real-time data buffer
-        self.data_buffer = []
+        # Real-time data buffer (ring buffer: O(1) append, oldest rows drop off)
         self.buffer_size = 1000
+        self.data_buffer = deque(maxlen=self.buffer_size)
         
-        print("🚀 Advanced ML Engine initialized")
-        print(f"   Seq2Seq-VAE + Bidirectional GRU + Attention")
-        print(f"   Online Learning: Aggressive retraining enabled")
+        logger.info("🚀 Advanced ML Engine initialized")
+        logger.info("   Seq2Seq-VAE + Bidirectional GRU + Attention")
+        logger.info("   Online Learning: Aggressive retraining enabled")
 
     def _get_optimizer(self, learning_rate: float):
         """Return a stable Adam optimizer compatible with TF/Keras versions."""
+        # Decay the learning rate in-graph (restarting every 5 epochs)
+        # instead of adjusting it from a Python callback
+        if self._steps_per_epoch:
+            learning_rate = keras.optimizers.schedules.CosineDecayRestarts(
+                learning_rate, first_decay_steps=self._steps_per_epoch * 5
+            )
+
+        optimizer = None
         try:
             legacy = getattr(keras.optimizers, 'legacy', None)
             if legacy and hasattr(legacy, 'Adam'):
-                return legacy.Adam(learning_rate=learning_rate)
+                optimizer = legacy.Adam(learning_rate=learning_rate)
         except Exception:
             pass
-        return keras.optimizers.Adam(learning_rate=learning_rate)
+        if optimizer is None:
+            optimizer = keras.optimizers.Adam(learning_rate=learning_rate)
+
+        # Scale the loss so float16 gradients don't underflow
+        if keras.mixed_precision.global_policy().name == 'mixed_float16':
+            optimizer = keras.mixed_precision.LossScaleOptimizer(optimizer)
+        return optimizer
+
+    @staticmethod
+    def _has_recurrent_layers(*models):
+        """Whether any model contains a (possibly bidirectional) RNN layer"""
+        return any(
+            isinstance(layer, (keras.layers.RNN, keras.layers.Bidirectional))
+            for model in models
+            for layer in model.layers
+        )
+
+    def _build_inference_fns(self):
+        """Trace concrete functions for batch-of-one inference"""
+        x_spec = tf.TensorSpec([1, self.lookback, 2], tf.float32)
+        w_spec = tf.TensorSpec([3], tf.float32)
+        # The distilled student serves the seq2seq_vae ensemble slot
+        vae, gru, attn = self.vae_student, self.bidirectional_gru, self.attention_model
+
+        # All three models in one graph: one input copy, one readback, and the
+        # weighted ensemble is computed on device. Not XLA-compiled: the
+        # BiGRU and GRU student use cuDNN kernels that XLA can't compile.
+        @tf.function(jit_compile=False)
+        def fused_predict(x, weights):
+            preds = tf.stack([
+                vae(x, training=False)[0],
+                gru(x, training=False)[0],
+                attn(x, training=False)[0]
+            ])
+            return preds, tf.tensordot(weights, preds, axes=1)
+
+        self._fused_infer = fused_predict.get_concrete_function(x_spec, w_spec)
+
+        # VAE student alone, for when GRU/attention are served by TFLite
+        # (a GRU too, so no XLA either)
+        self._vae_infer = tf.function(
+            lambda x: vae(x, training=False), jit_compile=False
+        ).get_concrete_function(x_spec)
+
+    def _quantize_int8(self, model, rep_data):
+        """
+        Post-training INT8 quantization of a trained model via TFLite
+
+        Args:
+            model: Trained Keras model
+            rep_data: Training windows used to calibrate activation ranges
+
+        Returns:
+            Serialized TFLite flatbuffer
+        """
+        def rep_data_gen():
+            for window in rep_data[:100]:
+                yield [np.expand_dims(window, axis=0).astype(np.float32)]
+
+        converter = tf.lite.TFLiteConverter.from_keras_model(model)
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = rep_data_gen
+        # Recurrent ops without an INT8 builtin kernel fall back to TF select ops
+        converter.target_spec.supported_ops = [
+            tf.lite.OpsSet.TFLITE_BUILTINS_INT8,
+            tf.lite.OpsSet.SELECT_TF_OPS
+        ]
+
+        return converter.convert()
+
+    def _load_tflite(self, model_content):
+        """Create a TFLite interpreter as (interpreter, input_index, output_index)"""
+        interpreter = tf.lite.Interpreter(model_content=model_content)
+        interpreter.allocate_tensors()
+        return (
+            interpreter,
+            interpreter.get_input_details()[0]['index'],
+            interpreter.get_output_details()[0]['index']
+        )
+
+    def _invoke_tflite(self, name, X):
+        """Run one input window through a quantized TFLite model"""
+        interpreter, input_index, output_index = self._tflite_models[name]
+        interpreter.set_tensor(input_index, X)
+        interpreter.invoke()
+        return interpreter.get_tensor(output_index)
     
+    def _named_models(self):
+        """Trained models keyed by name (ensemble members use model_weights keys)"""
+        return [
+            ('seq2seq_vae', self.seq2seq_vae_model),
+            ('vae_student', self.vae_student),
+            ('bigru', self.bidirectional_gru),
+            ('attention', self.attention_model)
+        ]
+
+    def _has_saved_weights(self, weights_dir):
+        """Whether weights_dir holds weights for every ensemble member"""
+        return all(
+            os.path.exists(os.path.join(weights_dir, f"{name}.weights.h5"))
+            for name, _ in self._named_models()
+        )
+
+    def _save_weights(self, weights_dir):
+        """Atomically write every model's weights to weights_dir"""
+        for name, model in self._named_models():
+            final_path = os.path.join(weights_dir, f"{name}.weights.h5")
+            tmp_path = os.path.join(weights_dir, f"{name}.tmp.weights.h5")
+            model.save_weights(tmp_path)
+            os.replace(tmp_path, final_path)
+
+    def _load_weights(self, weights_dir):
+        """Load every model's weights from weights_dir"""
+        for name, model in self._named_models():
+            model.load_weights(os.path.join(weights_dir, f"{name}.weights.h5"))
+
+    def _export_state(self):
+        """Non-Keras state a retrain produces, in picklable form"""
+        return {
+            'scaler': self.scaler,
+            'price_scale': self._price_scale,
+            'price_min': self._price_min,
+            'model_weights': self.model_weights,
+            'tflite_content': self._tflite_content,
+            'steps_per_epoch': self._steps_per_epoch,
+            'running_min': self._running_min,
+            'running_max': self._running_max,
+            'last_seen': self._last_seen
+        }
+
+    def _apply_state(self, state):
+        """Restore state produced by _export_state"""
+        self.scaler = state['scaler']
+        self._price_scale = state['price_scale']
+        self._price_min = state['price_min']
+        self._set_model_weights(state['model_weights'])
+        self._tflite_content = state['tflite_content']
+        self._steps_per_epoch = state['steps_per_epoch']
+        self._running_min = state['running_min']
+        self._running_max = state['running_max']
+        self._last_seen = state['last_seen']
+        self._tflite_models = {
+            name: self._load_tflite(content)
+            for name, content in self._tflite_content.items()
+        }
+
+    def _build_models(self, input_shape):
+        """Build any ensemble member that doesn't exist yet"""
+        if self.seq2seq_vae_model is None:
+            logger.info("🏗️  Building Seq2Seq-VAE...")
+            self.seq2seq_vae_model = self._build_seq2seq_vae(input_shape)
+
+        if self.vae_student is None:
+            self.vae_student = self._build_vae_student(input_shape)
+        
+        if self.bidirectional_gru is None:
+            logger.info("🏗️  Building Bidirectional GRU...")
+            self.bidirectional_gru = self._build_bidirectional_gru(input_shape)
+        
+        if self.attention_model is None:
+            logger.info("🏗️  Building Attention Model...")
+            self.attention_model = self._build_attention_model(input_shape)
+
     def _build_seq2seq_vae(self, input_shape):
         """
         Build Seq2Seq with VAE for robust predictions
@@ -84,11 +321,22 @@ class AdvancedMLEngine:
         
         # Sampling layer
         class Sampling(keras.layers.Layer):
-            def call(self, inputs):
+            def __init__(self, **kwargs):
+                super().__init__(**kwargs)
+                # PRNG state shared across calls: a counter seeding stateless draws
+                self.seed_ctr = tf.Variable(0, dtype=tf.int64, trainable=False)
+
+            # Not XLA-compiled: it runs inside the VAE graph next to the cuDNN GRUs
+            def call(self, inputs, training=None):
                 z_mean, z_log_var = inputs
-                batch = tf.shape(z_mean)[0]  # type: ignore[index]
-                dim = tf.shape(z_mean)[1]  # type: ignore[index]
-                epsilon = tf.random.normal(shape=(batch, dim))
+                if not training:
+                    # predict()/evaluate() decode the mean, so the distillation
+                    # targets are the VAE's expected output, not one noisy draw
+                    return z_mean
+                seed = tf.stack([self.seed_ctr.assign_add(1), tf.constant(0, tf.int64)])
+                epsilon = tf.random.stateless_normal(
+                    tf.shape(z_mean), seed=seed, dtype=z_mean.dtype
+                )
                 return z_mean + tf.exp(0.5 * z_log_var) * epsilon
         
         z = Sampling()([z_mean, z_log_var])
@@ -98,7 +346,7 @@ class AdvancedMLEngine:
         decoder_dense = keras.layers.RepeatVector(self.prediction_horizon)(decoder_dense)
         decoder_gru = keras.layers.GRU(128, return_sequences=True)(decoder_dense)
         decoder_outputs = keras.layers.TimeDistributed(
-            keras.layers.Dense(1)
+            keras.layers.Dense(1, dtype='float32')
         )(decoder_gru)
         
         # Build model
@@ -113,23 +361,50 @@ class AdvancedMLEngine:
         
         return model
     
+    def _build_vae_student(self, input_shape):
+        """
+        Build the single-GRU student distilled from the Seq2Seq-VAE
+
+        Deterministic and unidirectional, with no sampling or decoder
+        expansion, so it is much cheaper than the VAE on the inference path.
+        """
+        model = keras.Sequential([
+            keras.layers.GRU(128, input_shape=input_shape),
+            keras.layers.Dense(self.prediction_horizon, dtype='float32')
+        ])
+
+        model.compile(
+            optimizer=self._get_optimizer(0.001),
+            loss='mse'
+        )
+
+        return model
+    
     def _build_bidirectional_gru(self, input_shape):
         """
         Build Bidirectional GRU with dropout for robustness
+
+        Dropout sits between the recurrent layers rather than inside the GRU
+        cells so every layer qualifies for the fused cuDNN kernel.
         """
         model = keras.Sequential([
             keras.layers.Bidirectional(
-                keras.layers.GRU(256, return_sequences=True, dropout=0.2)
+                keras.layers.GRU(256, return_sequences=True, reset_after=True,
+                                 recurrent_activation='sigmoid')
             , input_shape=input_shape),
+            keras.layers.Dropout(0.2),
             keras.layers.Bidirectional(
-                keras.layers.GRU(128, return_sequences=True, dropout=0.2)
+                keras.layers.GRU(128, return_sequences=True, reset_after=True,
+                                 recurrent_activation='sigmoid')
             ),
+            keras.layers.Dropout(0.2),
             keras.layers.Bidirectional(
-                keras.layers.GRU(64, dropout=0.2)
+                keras.layers.GRU(64, reset_after=True, recurrent_activation='sigmoid')
             ),
+            keras.layers.Dropout(0.2),
             keras.layers.Dense(128, activation='relu'),
             keras.layers.Dropout(0.3),
-            keras.layers.Dense(self.prediction_horizon)
+            keras.layers.Dense(self.prediction_horizon, dtype='float32')
         ])
         
         model.compile(
@@ -146,9 +421,11 @@ class AdvancedMLEngine:
         """
         inputs = keras.Input(shape=input_shape)
         
-        # Multi-head attention
+        # Multi-head attention. Attention-score dropout stays at 0 so Keras
+        # dispatches to its fused dot-product-attention kernel; regularization
+        # is applied to the layer output below instead.
         attention_output = keras.layers.MultiHeadAttention(
-            num_heads=8, key_dim=64
+            num_heads=8, key_dim=64, dropout=0.0
         )(inputs, inputs)
         attention_output = keras.layers.Dropout(0.2)(attention_output)
         attention_output = keras.layers.LayerNormalization()(attention_output + inputs)
@@ -163,13 +440,16 @@ class AdvancedMLEngine:
         pooled = keras.layers.GlobalAveragePooling1D()(ff_output)
         outputs = keras.layers.Dense(128, activation='relu')(pooled)
         outputs = keras.layers.Dropout(0.3)(outputs)
-        outputs = keras.layers.Dense(self.prediction_horizon)(outputs)
+        outputs = keras.layers.Dense(self.prediction_horizon, dtype='float32')(outputs)
         
         model = keras.Model(inputs, outputs)
+        # XLA-compile the train/eval steps so the attention block is fused;
+        # only while the model has no recurrent layers (cuDNN RNNs can't be compiled)
         model.compile(
             optimizer=self._get_optimizer(0.001),
             loss='mse',
-            metrics=['mae']
+            metrics=['mae'],
+            jit_compile=not self._has_recurrent_layers(model)
         )
         
         return model
@@ -186,123 +466,260 @@ class AdvancedMLEngine:
             self.is_training = True
             
             try:
-                print(f"\n🔥 {'AGGRESSIVE' if aggressive else 'STANDARD'} Training Started")
-                print(f"   Data points: {len(historical_data)}")
+                logger.info("🔥 %s Training Started", 'AGGRESSIVE' if aggressive else 'STANDARD')
+                logger.info("   Data points: %d", len(historical_data))
                 
                 # Prepare data
                 X, y = self._prepare_training_data(historical_data)
                 
                 if X is None or len(X) < 10:
-                    print("❌ Insufficient data for training")
+                    logger.error("❌ Insufficient data for training")
                     self.is_training = False
                     return {'success': False, 'error': 'Insufficient data'}
                 
                 input_shape = (X.shape[1], X.shape[2])
                 
-                # Build models if not exist
-                if self.seq2seq_vae_model is None:
-                    print("🏗️  Building Seq2Seq-VAE...")
-                    self.seq2seq_vae_model = self._build_seq2seq_vae(input_shape)
-                
-                if self.bidirectional_gru is None:
-                    print("🏗️  Building Bidirectional GRU...")
-                    self.bidirectional_gru = self._build_bidirectional_gru(input_shape)
-                
-                if self.attention_model is None:
-                    print("🏗️  Building Attention Model...")
-                    self.attention_model = self._build_attention_model(input_shape)
-                
-                # Training parameters
+                # Training parameters. Large batches keep the GPU busy; the
+                # list is stepped down if the device runs out of memory.
                 epochs = 50 if aggressive else 30
-                batch_size = 16 if aggressive else 32
+                batch_sizes = [256, 128, 64, 32] if aggressive else [128, 64, 32]
+
+                if self._steps_per_epoch is None:
+                    self._steps_per_epoch = max(1, math.ceil(int(len(X) * 0.9) / batch_sizes[0]))
+                
+                # Build models if not exist
+                self._build_models(input_shape)
+
+                # Input pipelines shared by all three models, per batch size
+                datasets = {}
                 
                 # Train Seq2Seq-VAE
-                print("\n📊 Training Seq2Seq-VAE...")
-                self.seq2seq_vae_model.fit(
-                    X, y,
-                    epochs=epochs,
-                    batch_size=batch_size,
-                    validation_split=0.1,
-                    verbose=0,
-                    callbacks=[
-                        keras.callbacks.EarlyStopping(patience=5, restore_best_weights=True),
-                        keras.callbacks.ReduceLROnPlateau(factor=0.5, patience=3)
-                    ]
+                logger.info("📊 Training Seq2Seq-VAE...")
+                history_vae = self._fit_model(
+                    self.seq2seq_vae_model, X, y, epochs, batch_sizes, datasets
+                )
+
+                # Distill the VAE into the student used for inference
+                logger.info("📊 Distilling Seq2Seq-VAE into GRU student...")
+                teacher_y = self.seq2seq_vae_model.predict(
+                    X, batch_size=batch_sizes[0], verbose=0
+                )[:, :, 0]
+                self.vae_student.fit(
+                    X, teacher_y,
+                    epochs=max(5, epochs // 5),
+                    batch_size=batch_sizes[0],
+                    verbose=0
                 )
                 
                 # Train Bidirectional GRU
-                print("📊 Training Bidirectional GRU...")
-                history_gru = self.bidirectional_gru.fit(
-                    X, y,
-                    epochs=epochs,
-                    batch_size=batch_size,
-                    validation_split=0.1,
-                    verbose=0,
-                    callbacks=[
-                        keras.callbacks.EarlyStopping(patience=5, restore_best_weights=True),
-                        keras.callbacks.ReduceLROnPlateau(factor=0.5, patience=3)
-                    ]
+                logger.info("📊 Training Bidirectional GRU...")
+                history_gru = self._fit_model(
+                    self.bidirectional_gru, X, y, epochs, batch_sizes, datasets
                 )
                 
                 # Train Attention Model
-                print("📊 Training Attention Model...")
-                history_attn = self.attention_model.fit(
-                    X, y,
-                    epochs=epochs,
-                    batch_size=batch_size,
-                    validation_split=0.1,
-                    verbose=0,
-                    callbacks=[
-                        keras.callbacks.EarlyStopping(patience=5, restore_best_weights=True),
-                        keras.callbacks.ReduceLROnPlateau(factor=0.5, patience=3)
-                    ]
+                logger.info("📊 Training Attention Model...")
+                history_attn = self._fit_model(
+                    self.attention_model, X, y, epochs, batch_sizes, datasets
                 )
                 
                 # Update model weights based on performance
-                self._update_ensemble_weights(history_gru, history_attn)
+                self._update_ensemble_weights(history_vae, history_gru, history_attn)
+
+                if self.use_int8:
+                    try:
+                        logger.info("🗜️  Quantizing GRU + Attention to INT8...")
+                        self._tflite_content = {
+                            'bigru': self._quantize_int8(self.bidirectional_gru, X),
+                            'attention': self._quantize_int8(self.attention_model, X)
+                        }
+                        self._tflite_models = {
+                            name: self._load_tflite(content)
+                            for name, content in self._tflite_content.items()
+                        }
+                    except Exception as e:
+                        logger.warning("⚠️  INT8 quantization failed, using float models: %s", e)
+                        self._tflite_content = {}
+                        self._tflite_models = {}
                 
-                print(f"\n✅ Training Complete!")
-                print(f"   Model Weights: {self.model_weights}")
+                logger.info("✅ Training Complete!")
+                logger.info("   Model Weights: %s", self.model_weights)
                 
-                self.is_training = False
-                return {
+                result = {
                     'success': True,
                     'models_trained': 3,
                     'epochs': epochs,
+                    'batch_size': batch_sizes[0],
                     'training_samples': len(X)
                 }
                 
             except Exception as e:
-                print(f"❌ Training error: {e}")
+                logger.exception("❌ Training error: %s", e)
                 self.is_training = False
                 return {'success': False, 'error': str(e)}
+
+            # Outside the training try: the models are trained either way, and
+            # predict() traces the functions itself if this fails
+            if self._fused_infer is None:
+                try:
+                    self._build_inference_fns()
+                except Exception as e:
+                    logger.warning("⚠️  Could not trace inference functions: %s", e)
+
+            self.is_training = False
+            return result
+    
+    def _fit_model(self, model, X, y, epochs, batch_sizes, datasets):
+        """
+        Fit one model, falling back to smaller batches on out-of-memory
+
+        Args:
+            batch_sizes: Candidate batch sizes, largest first. Sizes that run
+                out of memory are dropped so later models skip them.
+            datasets: Cache of (train_ds, val_ds) keyed by batch size
+        """
+        while True:
+            batch_size = batch_sizes[0]
+            if batch_size not in datasets:
+                datasets[batch_size] = self._make_datasets(X, y, batch_size)
+            train_ds, val_ds = datasets[batch_size]
+
+            try:
+                # Validate every epoch so EarlyStopping always has val_loss;
+                # the held-out 10% is small next to the training pass
+                return model.fit(
+                    train_ds,
+                    validation_data=val_ds,
+                    epochs=epochs,
+                    verbose=0,
+                    callbacks=[
+                        keras.callbacks.EarlyStopping(
+                            monitor='val_loss', patience=5, restore_best_weights=True
+                        )
+                    ]
+                )
+            except tf.errors.ResourceExhaustedError:
+                if len(batch_sizes) == 1:
+                    raise
+                logger.warning("⚠️  Out of memory at batch size %d, retrying smaller", batch_size)
+                batch_sizes.pop(0)
+                datasets.pop(batch_size)
+
+    def _make_datasets(self, X, y, batch_size):
+        """
+        Build shuffled, prefetched tf.data pipelines for training
+
+        The last 10% of windows are held out for validation, matching the
+        split Keras makes for validation_split=0.1.
+        """
+        split_at = int(len(X) * 0.9)
+        train_ds = (
+            tf.data.Dataset.from_tensor_slices((X[:split_at], y[:split_at]))
+            .shuffle(2048)
+            .batch(batch_size)
+            .prefetch(tf.data.AUTOTUNE)
+        )
+        val_ds = (
+            tf.data.Dataset.from_tensor_slices((X[split_at:], y[split_at:]))
+            .batch(batch_size)
+            .prefetch(tf.data.AUTOTUNE)
+        )
+        return train_ds, val_ds
     
+    def _to_f32(self, df: pd.DataFrame):
+        """Select close price and volume as a float32 array"""
+        if 'close' in df.columns:
+            cols = df[['close', 'volume']]
+        elif 'Close' in df.columns:
+            cols = df[['Close', 'Volume']]
+        else:
+            cols = df.iloc[:, [3, 4]]  # Assuming OHLCV order
+        return cols.to_numpy(dtype=np.float32, copy=False)
+
+    def _fit_scaler(self, price_data, index=None):
+        """
+        Fit the min-max scaler with float32 NumPy math and return scaled data
+
+        With a DatetimeIndex the fit is incremental: only rows newer than the
+        last call are folded into the running min/max, and the scaler is
+        refitted only if they widen the range. Otherwise (first call, or no
+        timestamps to tell new rows apart) the full history is scanned.
+
+        The fitted parameters are stored on self.scaler so it stays a valid
+        MinMaxScaler for transform/inverse_transform.
+        """
+        streaming = (
+            isinstance(index, pd.DatetimeIndex) and
+            self._running_min is not None and
+            self._last_seen is not None
+        )
+
+        if streaming:
+            new_rows = price_data[index > self._last_seen]
+            data_min, data_max = self._running_min, self._running_max
+            if len(new_rows):
+                data_min = np.minimum(data_min, new_rows.min(axis=0))
+                data_max = np.maximum(data_max, new_rows.max(axis=0))
+        else:
+            data_min = price_data.min(axis=0)
+            data_max = price_data.max(axis=0)
+
+        self._last_seen = index[-1] if isinstance(index, pd.DatetimeIndex) and len(index) else None
+
+        # No drift outside the known range: keep the current fit
+        if (streaming and np.array_equal(data_min, self._running_min) and
+                np.array_equal(data_max, self._running_max)):
+            return self._scale(price_data)
+
+        self._running_min = data_min
+        self._running_max = data_max
+        data_range = data_max - data_min
+        scale = 1.0 / np.where(data_range == 0, 1, data_range).astype(np.float32)
+
+        self.scaler.data_min_ = data_min
+        self.scaler.data_max_ = data_max
+        self.scaler.data_range_ = data_range
+        self.scaler.scale_ = scale
+        self.scaler.min_ = -data_min * scale
+        self.scaler.n_features_in_ = price_data.shape[1]
+        self.scaler.n_samples_seen_ = len(price_data)
+
+        return self._scale(price_data)
+
+    def _scale(self, price_data):
+        """Apply the fitted min-max scaling as one multiply-add"""
+        return price_data * self.scaler.scale_ + self.scaler.min_
+
     def _prepare_training_data(self, df: pd.DataFrame):
         """Prepare sequences for training"""
         try:
             # Use close price and volume
-            if 'close' in df.columns:
-                price_data = df[['close', 'volume']].values
-            elif 'Close' in df.columns:
-                price_data = df[['Close', 'Volume']].values
-            else:
-                price_data = df.iloc[:, [3, 4]].values  # Assuming OHLCV order
+            price_data = self._to_f32(df)
             
             # Scale data
-            scaled_data = self.scaler.fit_transform(price_data)
+            scaled_data = self._fit_scaler(price_data, df.index)
+            self._price_scale = 1.0 / self.scaler.scale_[0]
+            self._price_min = self.scaler.data_min_[0]
             
-            X, y = [], []
-            for i in range(self.lookback, len(scaled_data) - self.prediction_horizon):
-                X.append(scaled_data[i-self.lookback:i])
-                y.append(scaled_data[i:i+self.prediction_horizon, 0])  # Predict close price
-            
-            if len(X) == 0:
+            n_samples = len(scaled_data) - self.lookback - self.prediction_horizon
+            if n_samples <= 0:
                 return None, None
-            
-            return np.array(X), np.array(y)
+
+            # Strided windows over the scaled series (no per-sample Python loop)
+            windows = np.lib.stride_tricks.sliding_window_view(
+                scaled_data, window_shape=(self.lookback, scaled_data.shape[1])
+            )[:, 0]
+            targets = np.lib.stride_tricks.sliding_window_view(
+                scaled_data[:, 0], self.prediction_horizon  # Predict close price
+            )
+
+            X = windows[:n_samples]
+            y = targets[self.lookback:self.lookback + n_samples]
+
+            return np.ascontiguousarray(X), np.ascontiguousarray(y)
             
         except Exception as e:
-            print(f"Error preparing data: {e}")
+            logger.exception("Error preparing data: %s", e)
             return None, None
     
     def predict(self, recent_data: pd.DataFrame):
@@ -315,7 +732,7 @@ class AdvancedMLEngine:
         Returns:
             Dict with predictions and confidence
         """
-        if self.seq2seq_vae_model is None:
+        if self.seq2seq_vae_model is None or self.vae_student is None:
             return {'error': 'Models not trained yet'}
 
         if self.bidirectional_gru is None or self.attention_model is None:
@@ -323,74 +740,88 @@ class AdvancedMLEngine:
         
         try:
             # Prepare input
-            if 'close' in recent_data.columns:
-                price_data = recent_data[['close', 'volume']].values
-            elif 'Close' in recent_data.columns:
-                price_data = recent_data[['Close', 'Volume']].values
-            else:
-                price_data = recent_data.iloc[:, [3, 4]].values
-            
-            scaled_data = self.scaler.transform(price_data[-self.lookback:])
-            X = np.expand_dims(scaled_data, axis=0)
-            
-            # Get predictions from all models
-            pred_vae = self.seq2seq_vae_model.predict(X, verbose=0)[0, :, 0]
-            pred_gru = self.bidirectional_gru.predict(X, verbose=0)[0]
-            pred_attn = self.attention_model.predict(X, verbose=0)[0]
-            
-            # Ensemble prediction
-            ensemble_pred = (
-                self.model_weights['seq2seq_vae'] * pred_vae +
-                self.model_weights['bigru'] * pred_gru +
-                self.model_weights['attention'] * pred_attn
-            )
-            
-            # Inverse transform
-            dummy_data = np.zeros((len(ensemble_pred), 2))
-            dummy_data[:, 0] = ensemble_pred
-            predicted_prices = self.scaler.inverse_transform(dummy_data)[:, 0]
-            
-            # Calculate confidence based on model agreement
-            std_dev = np.std([pred_vae, pred_gru, pred_attn], axis=0)
-            avg_std = np.mean(std_dev)
-            confidence = max(0.5, 1.0 - (avg_std * 10))  # Heuristic
+            price_data = self._to_f32(recent_data)
             
-            return {
-                'predicted_prices': predicted_prices.tolist(),
-                'horizon_hours': self.prediction_horizon,
-                'confidence': float(confidence),
-                'ensemble_weights': self.model_weights,
-                'individual_predictions': {
-                    'seq2seq_vae': pred_vae.tolist(),
-                    'bigru': pred_gru.tolist(),
-                    'attention': pred_attn.tolist()
+            scaled_data = self._scale(price_data[-self.lookback:])
+            X = tf.convert_to_tensor(np.expand_dims(scaled_data, axis=0), dtype=tf.float32)
+
+            if self._fused_infer is None:
+                self._build_inference_fns()
+
+            # The prediction buffer and TFLite interpreters are shared state
+            with self._predict_lock:
+                if self._pred_buf is None:
+                    self._pred_buf = np.empty((3, self.prediction_horizon), dtype=np.float32)
+                preds = self._pred_buf
+
+                # Get predictions from all models via the pre-traced functions
+                # (no predict() data adapter, callbacks or retracing)
+                if self._tflite_models:
+                    out_vae = self._vae_infer(X)
+                    X_host = X.numpy()
+                    preds[1] = self._invoke_tflite('bigru', X_host)[0]
+                    preds[2] = self._invoke_tflite('attention', X_host)[0]
+                    preds[0] = np.asarray(out_vae)[0]
+                    ensemble_pred = self._weights_vec @ preds
+                else:
+                    out_preds, out_ensemble = self._fused_infer(
+                        X, tf.constant(self._weights_vec)
+                    )
+                    preds[:] = out_preds
+                    ensemble_pred = out_ensemble.numpy()
+                
+                # Inverse transform (close column only)
+                predicted_prices = ensemble_pred * self._price_scale + self._price_min
+                
+                # Calculate confidence based on model agreement
+                avg_std = preds.std(axis=0).mean()
+                confidence = max(0.5, 1.0 - (avg_std * 10))  # Heuristic
+                
+                return {
+                    'predicted_prices': predicted_prices.tolist(),
+                    'horizon_hours': self.prediction_horizon,
+                    'confidence': float(confidence),
+                    'ensemble_weights': self.model_weights,
+                    'individual_predictions': {
+                        'seq2seq_vae': preds[0].tolist(),
+                        'bigru': preds[1].tolist(),
+                        'attention': preds[2].tolist()
+                    }
                 }
-            }
             
         except Exception as e:
-            print(f"Prediction error: {e}")
+            logger.exception("Prediction error: %s", e)
             return {'error': str(e)}
     
-    def _update_ensemble_weights(self, history_gru, history_attn):
-        """Dynamically update ensemble weights based on validation performance"""
-        try:
-            # Get final validation losses
-            gru_loss = history_gru.history['val_loss'][-1] if 'val_loss' in history_gru.history else 1.0
-            attn_loss = history_attn.history['val_loss'][-1] if 'val_loss' in history_attn.history else 1.0
-            vae_loss = 0.8  # Approximate, as VAE has custom loss
-            
-            # Inverse losses for weights (lower loss = higher weight)
-            total = (1/gru_loss) + (1/attn_loss) + (1/vae_loss)
-            
-            self.model_weights = {
-                'seq2seq_vae': (1/vae_loss) / total,
-                'bigru': (1/gru_loss) / total,
-                'attention': (1/attn_loss) / total
-            }
-            
-        except:
+    def _update_ensemble_weights(self, *histories):
+        """
+        Dynamically update ensemble weights based on validation performance
+
+        Args:
+            histories: fit() histories in model_weights order
+                (seq2seq_vae, bigru, attention)
+        """
+        # Final validation losses; inverse losses for weights (lower loss = higher weight)
+        losses = np.fromiter(
+            (h.history.get('val_loss', [1.0])[-1] for h in histories),
+            dtype=np.float64, count=len(histories)
+        )
+        inv = 1.0 / np.maximum(losses, 1e-12)
+        weights = inv / inv.sum()
+
+        if not np.all(np.isfinite(weights)):
             # Fallback to default weights
-            self.model_weights = {'seq2seq_vae': 0.4, 'bigru': 0.35, 'attention': 0.25}
+            weights = (0.4, 0.35, 0.25)
+
+        self._set_model_weights(dict(zip(('seq2seq_vae', 'bigru', 'attention'), map(float, weights))))
+
+    def _set_model_weights(self, weights):
+        """Set ensemble weights and the matching (3,) vector used by predict()"""
+        self.model_weights = weights
+        self._weights_vec = np.array(
+            [weights['seq2seq_vae'], weights['bigru'], weights['attention']],
+            dtype=np.float32
+        )
     
     def check_and_retrain(self, new_data: pd.DataFrame, current_accuracy: float):
         """
@@ -401,20 +832,63 @@ class AdvancedMLEngine:
             current_accuracy: Current prediction accuracy
         """
         if self.is_training:
-            print("⚠️  Already training, skipping retrain check")
+            logger.warning("⚠️  Already training, skipping retrain check")
             return
         
         accuracy_drop = self.last_accuracy - current_accuracy
         
         if accuracy_drop > self.retrain_threshold:
-            print(f"\n🔔 Accuracy dropped {accuracy_drop*100:.1f}%! Triggering aggressive retrain...")
+            logger.warning(
+                "🔔 Accuracy dropped %.1f%%! Triggering aggressive retrain...", accuracy_drop * 100
+            )
             
-            # Retrain in background thread
-            retrain_thread = threading.Thread(
-                target=self.train_models,
-                args=(new_data, True),
-                daemon=True
+            # Retrain in the background worker process, starting from current weights
+            with self.training_lock:
+                if self._weights_dir is None:
+                    self._weights_dir = tempfile.mkdtemp(prefix='cryptoai_ml_')
+                if self.seq2seq_vae_model is not None:
+                    self._save_weights(self._weights_dir)
+                self.is_training = True
+
+            config = {
+                'lookback': self.lookback,
+                'prediction_horizon': self.prediction_horizon,
+                'use_int8': self.use_int8
+            }
+            if self._retrain_pool is None:
+                # spawn, not fork: forking after TF/CUDA have started can deadlock the child
+                self._retrain_pool = ProcessPoolExecutor(
+                    max_workers=1, mp_context=multiprocessing.get_context('spawn')
+                )
+            self._retrain_future = self._retrain_pool.submit(
+                _retrain_worker, config, self._weights_dir,
+                self._export_state(), new_data, True
             )
-            retrain_thread.start()
+            self._retrain_future.add_done_callback(self._on_retrain_done)
         
         self.last_accuracy = current_accuracy
+
+    def _on_retrain_done(self, future):
+        """Swap in the weights produced by a background retrain"""
+        try:
+            result, state = future.result()
+            if not result.get('success'):
+                logger.error("❌ Background retrain failed: %s", result.get('error'))
+                return
+
+            with self.training_lock:
+                # State first: model building reads it (e.g. the LR schedule's steps per epoch)
+                self._apply_state(state)
+                self._build_models((self.lookback, 2))
+                self._load_weights(self._weights_dir)
+                # Re-trace against the current model objects (swapped in once traced)
+                try:
+                    self._build_inference_fns()
+                except Exception as e:
+                    logger.warning("⚠️  Could not trace inference functions: %s", e)
+
+            logger.info("✅ Background retrain complete! Model Weights: %s", self.model_weights)
+        except Exception as e:
+            logger.exception("❌ Background retrain error: %s", e)
+        finally:
+            self.is_training = False
@@ -0,0 +1,256 @@
+/*
+ * Client-side renderers for the CryptoAI dashboards (dashboard.py and
+ * dashboard_enhanced.py share this assets folder)
+ * The server publishes raw numbers into dcc.Store components and these
+ * functions do the formatting in the browser.
+ */
+(function () {
+    function money(value, digits) {
+        return '$' + Number(value || 0).toLocaleString('en-US', {
+            minimumFractionDigits: digits,
+            maximumFractionDigits: digits
+        });
+    }
+
+    function signed(value, digits) {
+        var n = Number(value || 0);
+        return (n >= 0 ? '+' : '') + n.toFixed(digits);
+    }
+
+    function count(value) {
+        return Number(value || 0).toLocaleString('en-US');
+    }
+
+    function component(namespace, type, props) {
+        return {namespace: namespace, type: type, props: props};
+    }
+
+    function alert(text, color) {
+        return component('dash_bootstrap_components', 'Alert', {children: text, color: color});
+    }
+
+    function statLine(label, value, className) {
+        var props = {
+            children: [component('dash_html_components', 'Strong', {children: label}), value]
+        };
+        if (className) {
+            props.className = className;
+        }
+        return component('dash_html_components', 'P', props);
+    }
+
+    function titleCase(text) {
+        return String(text).replace(/_/g, ' ').toLowerCase().replace(/\b\w/g, function (c) {
+            return c.toUpperCase();
+        });
+    }
+
+    // Mirrors SIGNAL_COLOR in dashboard.py
+    var SIGNAL_COLOR = {
+        strong_buy: 'success',
+        buy: 'info',
+        neutral: 'secondary',
+        sell: 'warning',
+        strong_sell: 'danger'
+    };
+
+    var CARD_BG = '#141b2d';  // COLORS['card_bg'] in dashboard.py
+
+    function suggestionCard(s, rank) {
+        var html = 'dash_html_components';
+        var dbc = 'dash_bootstrap_components';
+        var signal = s.signal || 'neutral';
+        var change = Number(s.price_change_24h || 0);
+
+        function col(lines) {
+            return component(dbc, 'Col', {children: lines, width: 4});
+        }
+
+        return component(dbc, 'Card', {
+            className: 'mb-3',
+            style: {backgroundColor: CARD_BG},
+            children: [
+                component(dbc, 'CardHeader', {
+                    children: component(html, 'H5', {
+                        className: 'mb-0',
+                        children: [
+                            '#' + rank + ' ' + String(s.symbol || '?').toUpperCase() + ' ',
+                            component(dbc, 'Badge', {
+                                children: signal.toUpperCase(),
+                                color: SIGNAL_COLOR[signal] || 'secondary',
+                                className: 'ms-2'
+                            })
+                        ]
+                    })
+                }),
+                component(dbc, 'CardBody', {
+                    children: component(dbc, 'Row', {
+                        children: [
+                            col([
+                                statLine('Current Price: ', money(s.current_price, 6), 'mb-1'),
+                                statLine('24h Change: ', component(html, 'Span', {
+                                    children: signed(change, 2) + '%',
+                                    className: change > 0 ? 'text-success' : 'text-danger'
+                                }), 'mb-1'),
+                                statLine('Trend: ', titleCase(s.trend || 'neutral'), 'mb-1')
+                            ]),
+                            col([
+                                statLine('Confidence: ', Number(s.confidence || 0).toFixed(1) + '%', 'mb-1'),
+                                statLine('Score: ', Number(s.score || 0).toFixed(1) + '/100', 'mb-1'),
+                                statLine('Risk/Reward: ', Number(s.risk_reward_ratio || 0).toFixed(2), 'mb-1')
+                            ]),
+                            col([
+                                statLine('Suggested Investment: ', component(html, 'Span', {
+                                    children: money(s.suggested_investment, 2),
+                                    className: 'text-warning'
+                                }), 'mb-1'),
+                                statLine('Stop Loss: ', money(s.stop_loss, 6), 'mb-1'),
+                                statLine('Take Profit: ', money(s.take_profit, 6), 'mb-1')
+                            ])
+                        ]
+                    })
+                })
+            ]
+        });
+    }
+
+    // [rows, empty-state alert, hide table] for a table published in app-state
+    function tableOutputs(entry, emptyText) {
+        if (!entry) {
+            // Not refreshed on this tick
+            throw window.dash_clientside.PreventUpdate;
+        }
+        if (entry.error) {
+            return [[], alert('Data temporarily unavailable', 'warning'), true];
+        }
+        if (!entry.rows.length) {
+            return [[], alert(emptyText, 'info'), true];
+        }
+        return [entry.rows, null, false];
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        ui: {
+            render_portfolio: function (state) {
+                var p = state && state.portfolio;
+                if (!p) {
+                    return ['$0.00', '...', '$0.00', '0 positions', '$0.00', '+0.00%'];
+                }
+                return [
+                    money(p.current_value, 2),
+                    'Initial: ' + money(p.initial_balance, 2),
+                    money(p.cash_balance, 2),
+                    p.num_positions + ' positions',
+                    money(p.total_return, 2),
+                    signed(p.return_percent, 2) + '%'
+                ];
+            },
+
+            render_sentiment: function (state) {
+                var s = state && state.sentiment;
+                if (!s) {
+                    return ['Loading...', '...'];
+                }
+                if (s.market_cap_change_24h === null || s.market_cap_change_24h === undefined) {
+                    return [s.sentiment, '0.00%'];
+                }
+                return [s.sentiment, '24h: ' + signed(s.market_cap_change_24h, 2) + '%'];
+            },
+
+            render_market: function (state) {
+                var m = state && state.market;
+                if (!m) {
+                    return alert('Market data temporarily unavailable', 'info');
+                }
+                return [
+                    statLine('Total Market Cap: ', money(m.total_market_cap_usd, 0)),
+                    statLine('24h Volume: ', money(m.total_volume_24h_usd, 0)),
+                    statLine('BTC Dominance: ', Number(m.btc_dominance || 0).toFixed(2) + '%'),
+                    statLine('ETH Dominance: ', Number(m.eth_dominance || 0).toFixed(2) + '%'),
+                    statLine('Active Cryptocurrencies: ', count(m.active_cryptocurrencies)),
+                    statLine('Markets: ', count(m.markets))
+                ];
+            },
+
+            // [button disabled, cooldown interval disabled]: a click disables the
+            // button and starts a 1s interval whose first tick re-enables it
+            debounce_button: function (n_clicks, n_intervals) {
+                var triggered = window.dash_clientside.callback_context.triggered || [];
+                var clicked = triggered.some(function (t) {
+                    return /\.n_clicks$/.test(t.prop_id);
+                });
+                if (clicked && n_clicks) {
+                    return [true, false];
+                }
+                return [false, true];
+            },
+
+            // Enhanced dashboard: pass every 6th 5s tick through as the 30s slow tick
+            // (tick 0 is skipped; the slow callbacks already run on page load)
+            slow_tick: function (n) {
+                if (!n || n % 6 !== 0) {
+                    throw window.dash_clientside.PreventUpdate;
+                }
+                return n;
+            },
+
+            render_gainers: function (state) {
+                return tableOutputs(state && state.gainers, 'No gainers data available');
+            },
+
+            render_trending: function (state) {
+                return tableOutputs(state && state.trending, 'No trending data available');
+            },
+
+            // Enhanced dashboard header ticker: rows are [symbol, price, 24h change]
+            render_ticker: function (rows, colors) {
+                if (!rows) {
+                    return 'Loading market data...';
+                }
+                return rows.map(function (row) {
+                    var change = Number(row[2] || 0);
+                    return component('dash_html_components', 'Span', {
+                        style: {marginRight: '20px'},
+                        children: [
+                            row[0] + ': ' + money(row[1], 2) + ' ',
+                            component('dash_html_components', 'Span', {
+                                children: '(' + signed(change, 2) + '%)',
+                                style: {color: change >= 0 ? colors.up : colors.down}
+                            })
+                        ]
+                    });
+                });
+            },
+
+            render_suggestions: function (data) {
+                if (!data || data.status === 'idle') {
+                    return [alert("Click 'Refresh Suggestions' to see the latest trade ideas.", 'info')];
+                }
+                if (data.status === 'error') {
+                    return [alert('Error: ' + data.message, 'danger')];
+                }
+                if (!data.suggestions || !data.suggestions.length) {
+                    return [alert('Analyzing market... Please wait a moment and try again.', 'warning')];
+                }
+
+                return data.suggestions.map(function (s, i) {
+                    return suggestionCard(s, i + 1);
+                });
+            },
+
+            // Re-run by a browser-side interval, so the age ticks without the server
+            render_last_updated: function (n, data) {
+                if (!data || data.status !== 'ready' || !data.updated ||
+                        !data.suggestions || !data.suggestions.length) {
+                    return null;
+                }
+                var minutes = Math.max(0, Math.floor((Date.now() - Date.parse(data.updated)) / 60000));
+                return component('dash_bootstrap_components', 'Alert', {
+                    children: 'Last updated: ' + minutes + ' minute(s) ago',
+                    color: 'info',
+                    className: 'mb-3'
+                });
+            }
+        }
+    });
+})();
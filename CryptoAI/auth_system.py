@@ -4,17 +4,25 @@ Implements CORS Policy, Biometric Authentication, and 2FA
 """
 
 import os
+import re
 import jwt
 import pyotp
 import qrcode
+import base64
 import hashlib
+import hmac
+import io
 import secrets
-from datetime import datetime, timedelta
+import sqlite3
+from datetime import datetime
 from typing import Optional, Dict, Any
-from functools import wraps
+from functools import wraps, lru_cache
 from flask import Flask, request, jsonify, session
 from flask_cors import CORS
-import json
+import orjson
+import threading
+import time
+from collections import OrderedDict, deque
 from pathlib import Path
 
 class AuthConfig:
@@ -23,6 +31,15 @@ class AuthConfig:
     SECRET_KEY = os.getenv('AUTH_SECRET_KEY', secrets.token_hex(32))
     JWT_ALGORITHM = 'HS256'
     JWT_EXPIRATION_HOURS = 24
+    JWT_CACHE_SIZE = 1024  # Verified tokens kept to skip repeat decodes
+    REVOCATION_REFRESH_SECONDS = 2  # Logouts in other workers apply within this
+    
+    # 2FA throttling: N failed codes in a row lock the account out; each
+    # further lockout doubles, up to the maximum, until a code succeeds
+    TOTP_MAX_ATTEMPTS = 5
+    TOTP_LOCKOUT_SECONDS = 300
+    TOTP_MAX_LOCKOUT_SECONDS = 3600
+    TOTP_FAILURE_RESET_SECONDS = 900  # Failures older than this stop counting
     
     # CORS Configuration
     ALLOWED_ORIGINS = [
@@ -52,19 +69,51 @@ class AuthConfig:
         }
     }
     
+    # Permission lookups; the lists above stay as-is for JSON output
+    USER_PERMISSIONS = {
+        username: frozenset(user['permissions'])
+        for username, user in AUTHORIZED_USERS.items()
+    }
+    
+    # JWTs carry permissions as a bitmask under short claim names
+    PERMISSION_BITS = {'read': 1, 'write': 2, 'trade': 4, 'admin': 8}
+    
+    # Expired sessions are purged from the session store every N logins
+    SESSION_PURGE_EVERY = 500
+    
     # Asset access control
-    ASSET_CLASSES = [
+    ASSET_CLASSES_LIST = [
         'bitcoin', 'ethereum', 'binancecoin', 'cardano', 'solana',
         'polkadot', 'avalanche-2', 'polygon', 'chainlink', 'uniswap'
     ]
+    ASSET_CLASSES = frozenset(ASSET_CLASSES_LIST)
 
 class AuthenticationManager:
     """Manages authentication, 2FA, and biometric verification"""
     
     def __init__(self):
-        self.config = AuthConfig()
+        self.config = AuthConfig  # Class attributes only; nothing to instantiate
         self.users_db_path = Path('data/users_auth.json')
-        self.sessions_db_path = Path('data/sessions.json')
+        # SQLite so every server worker process sees the same sessions
+        self.sessions_db_path = Path('data/sessions.db')
+        # Snapshot + journal files from the previous session store, imported once
+        self.legacy_sessions_path = Path('data/sessions.json')
+        self.legacy_journal_path = Path('data/sessions.jsonl')
+        # blake2b(token) -> (payload, exp timestamp), least recently used first
+        self._jwt_cache: OrderedDict = OrderedDict()
+        self._jwt_lock = threading.Lock()
+        # blake2b keys of revoked tokens, reloaded from SQLite every
+        # REVOCATION_REFRESH_SECONDS (monotonic time of the last load)
+        self._revoked: frozenset = frozenset()
+        self._revoked_loaded_at: Optional[float] = None
+        self._revoked_lock = threading.Lock()
+        # (users, st_mtime_ns, st_size) of the last users_auth.json read
+        self._users_cache: Optional[tuple] = None
+        # username -> (secret, TOTP) so the secret is decoded once
+        self._totp_cache: Dict[str, tuple] = {}
+        # username -> [failures, last failure, locked until, lockouts] (monotonic times)
+        self._totp_attempts: Dict[str, list] = {}
+        self._totp_lock = threading.Lock()
         self._initialize_storage()
         
     def _initialize_storage(self):
@@ -74,31 +123,117 @@ class AuthenticationManager:
         if not self.users_db_path.exists():
             self._save_users({})
         
-        if not self.sessions_db_path.exists():
-            self._save_sessions({})
+        # One connection shared by the request threads of this process;
+        # WAL lets other worker processes read while one writes
+        self._sessions_lock = threading.Lock()
+        self._sessions_db = sqlite3.connect(
+            self.sessions_db_path, timeout=10, check_same_thread=False, isolation_level=None
+        )
+        with self._sessions_lock:
+            self._sessions_db.execute('PRAGMA journal_mode=WAL')
+            self._sessions_db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS sessions (
+                    id TEXT PRIMARY KEY,
+                    username TEXT NOT NULL,
+                    token TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL NOT NULL,
+                    metadata BLOB NOT NULL
+                )
+                """
+            )
+            # Logged-out tokens (blake2b hash), kept until the token itself expires
+            self._sessions_db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS revoked_tokens (
+                    token_hash BLOB PRIMARY KEY,
+                    expires_at REAL NOT NULL
+                )
+                """
+            )
+        self._session_writes = 0
+        
+        self._import_legacy_sessions()
     
     def _save_users(self, users: Dict):
         """Save users database"""
-        with open(self.users_db_path, 'w') as f:
-            json.dump(users, f, indent=2)
+        self._users_cache = None
+        with open(self.users_db_path, 'wb') as f:
+            f.write(orjson.dumps(users, option=orjson.OPT_INDENT_2))
     
     def _load_users(self) -> Dict:
-        """Load users database"""
-        with open(self.users_db_path, 'r') as f:
-            return json.load(f)
+        """Load users database (re-parsed only when the file changes)"""
+        st = os.stat(self.users_db_path)
+        key = (st.st_mtime_ns, st.st_size)
+        
+        cache = self._users_cache
+        if cache is not None and cache[1:] == key:
+            return cache[0]
+        
+        with open(self.users_db_path, 'rb') as f:
+            users = orjson.loads(f.read())
+        
+        self._users_cache = (users, *key)
+        return users
+    
+    def _read_legacy_sessions(self) -> Dict:
+        """Read the old sessions snapshot and replay its journal on top of it"""
+        with open(self.legacy_sessions_path, 'rb') as f:
+            sessions = orjson.loads(f.read())
+        
+        if self.legacy_journal_path.exists():
+            with open(self.legacy_journal_path, 'rb') as f:
+                for line in f:
+                    try:
+                        record = orjson.loads(line)
+                    except ValueError:
+                        continue  # Torn final line from an interrupted write
+                    if record['session'] is None:
+                        sessions.pop(record['id'], None)
+                    else:
+                        sessions[record['id']] = record['session']
+        
+        # Sessions written before timestamps became epoch seconds
+        for s in sessions.values():
+            for field in ('created_at', 'expires_at'):
+                if isinstance(s.get(field), str):
+                    s[field] = datetime.fromisoformat(s[field]).timestamp()
+        
+        return sessions
     
-    def _save_sessions(self, sessions: Dict):
-        """Save active sessions"""
-        with open(self.sessions_db_path, 'w') as f:
-            json.dump(sessions, f, indent=2)
+    def _import_legacy_sessions(self):
+        """Move sessions from the old JSON snapshot/journal files into SQLite"""
+        if not self.legacy_sessions_path.exists():
+            return
+        
+        now = time.time()
+        rows = [
+            (sid, s['username'], s['token'], s['created_at'], s['expires_at'],
+             orjson.dumps(s.get('metadata') or {}))
+            for sid, s in self._read_legacy_sessions().items()
+            if s['expires_at'] > now
+        ]
+        with self._sessions_lock:
+            self._sessions_db.executemany(
+                'INSERT OR IGNORE INTO sessions VALUES (?, ?, ?, ?, ?, ?)', rows
+            )
+        
+        # Renamed so deleted sessions are not imported again on the next start
+        for path in (self.legacy_sessions_path, self.legacy_journal_path):
+            try:
+                os.replace(path, path.with_name(path.name + '.imported'))
+            except FileNotFoundError:
+                pass  # Another worker got there first, or there was no journal
     
-    def _load_sessions(self) -> Dict:
-        """Load active sessions"""
-        with open(self.sessions_db_path, 'r') as f:
-            return json.load(f)
+    def _purge_expired_sessions(self):
+        """Delete expired sessions and revocations (caller holds _sessions_lock)"""
+        now = time.time()
+        self._sessions_db.execute('DELETE FROM sessions WHERE expires_at < ?', (now,))
+        self._sessions_db.execute('DELETE FROM revoked_tokens WHERE expires_at < ?', (now,))
     
     def generate_2fa_secret(self, username: str) -> tuple:
-        """Generate 2FA secret and QR code"""
+        """Generate 2FA secret and QR code (returns secret, PNG bytes)"""
         secret = pyotp.random_base32()
         totp = pyotp.TOTP(secret)
         
@@ -113,23 +248,84 @@ class AuthenticationManager:
         qr.add_data(qr_uri)
         qr.make(fit=True)
         
-        qr_path = Path(f'data/qr_codes/{username}_2fa.png')
-        qr_path.parent.mkdir(exist_ok=True)
-        
+        # Render in memory; callers decide whether to embed or save it
+        buf = io.BytesIO()
         img = qr.make_image(fill_color="black", back_color="white")
-        img.save(qr_path)
+        img.save(buf, format='PNG')
         
-        return secret, str(qr_path)
+        return secret, buf.getvalue()
+    
+    @staticmethod
+    def qr_data_uri(png_bytes: bytes) -> str:
+        """Data URI for embedding a QR PNG directly in an <img> tag"""
+        return 'data:image/png;base64,' + base64.b64encode(png_bytes).decode('ascii')
     
     def verify_2fa_token(self, username: str, token: str) -> bool:
         """Verify 2FA token"""
-        users = self._load_users()
+        if not self._allow_totp_attempt(username):
+            return False
+        
+        user = self._load_users().get(username)
+        
+        if user is None or '2fa_secret' not in user:
+            return False
+        
+        secret = user['2fa_secret']
+        cached = self._totp_cache.get(username)
+        if cached is None or cached[0] != secret:
+            # First use, or the secret was rotated
+            cached = (secret, pyotp.TOTP(secret))
+            self._totp_cache[username] = cached
         
-        if username not in users or '2fa_secret' not in users[username]:
+        if not cached[1].verify(token, valid_window=1):
             return False
         
-        totp = pyotp.TOTP(users[username]['2fa_secret'])
-        return totp.verify(token, valid_window=1)
+        with self._totp_lock:
+            self._totp_attempts.pop(username, None)
+        return True
+    
+    def _allow_totp_attempt(self, username: str) -> bool:
+        """
+        Count a 2FA attempt as failed until it succeeds
+        
+        Returns:
+            False while the account is locked out
+        """
+        config = self.config
+        now = time.monotonic()
+        
+        with self._totp_lock:
+            state = self._totp_attempts.get(username)
+            if state is None:
+                state = self._totp_attempts[username] = [0, now, 0.0, 0]
+            
+            if now < state[2]:
+                return False
+            
+            if now - state[1] >= config.TOTP_FAILURE_RESET_SECONDS:
+                state[0] = 0
+            
+            # Counted up front so concurrent guesses can't slip past the limit
+            state[0] += 1
+            state[1] = now
+            if state[0] >= config.TOTP_MAX_ATTEMPTS:
+                # This is the last attempt before the lockout starts
+                state[3] += 1
+                state[2] = now + min(
+                    config.TOTP_LOCKOUT_SECONDS * 2 ** (state[3] - 1),
+                    config.TOTP_MAX_LOCKOUT_SECONDS
+                )
+                state[0] = 0
+            
+            # Forget idle, unlocked accounts to keep the table small
+            if len(self._totp_attempts) > 1000:
+                for name in [
+                    name for name, st in self._totp_attempts.items()
+                    if now >= st[2] and now - st[1] >= config.TOTP_MAX_LOCKOUT_SECONDS
+                ]:
+                    del self._totp_attempts[name]
+        
+        return True
     
     def register_biometric(self, username: str, biometric_data: str) -> bool:
         """Register biometric data (fingerprint/face hash)"""
@@ -139,22 +335,23 @@ class AuthenticationManager:
             users[username] = {}
         
         # Hash biometric data for secure storage
-        biometric_hash = hashlib.sha256(biometric_data.encode()).hexdigest()
-        users[username]['biometric_hash'] = biometric_hash
-        users[username]['biometric_registered'] = datetime.now().isoformat()
+        biometric_hash = hashlib.sha256(biometric_data.encode()).digest()
+        users[username]['biometric_hash'] = biometric_hash.hex()
+        users[username]['biometric_registered'] = datetime.now()
         
         self._save_users(users)
         return True
     
     def verify_biometric(self, username: str, biometric_data: str) -> bool:
         """Verify biometric data"""
-        users = self._load_users()
+        user = self._load_users().get(username)
         
-        if username not in users or 'biometric_hash' not in users[username]:
+        if user is None or 'biometric_hash' not in user:
             return False
         
-        biometric_hash = hashlib.sha256(biometric_data.encode()).hexdigest()
-        return users[username]['biometric_hash'] == biometric_hash
+        # Constant-time comparison of the raw digests
+        biometric_hash = hashlib.sha256(biometric_data.encode()).digest()
+        return hmac.compare_digest(biometric_hash, bytes.fromhex(user['biometric_hash']))
     
     def generate_jwt_token(self, username: str, additional_claims: Dict = None) -> str:
         """Generate JWT access token"""
@@ -163,13 +360,16 @@ class AuthenticationManager:
         if not user_config:
             raise ValueError(f"User {username} not authorized")
         
+        now = int(time.time())
+        bits = self.config.PERMISSION_BITS
+        
+        # Compact claims: the token is sent and HMAC'd on every request;
+        # profile fields are filled back in from AuthConfig on verify
         payload = {
-            'username': username,
-            'github_username': user_config['github_username'],
-            'role': user_config['role'],
-            'permissions': user_config['permissions'],
-            'exp': datetime.utcnow() + timedelta(hours=self.config.JWT_EXPIRATION_HOURS),
-            'iat': datetime.utcnow(),
+            'u': username,
+            'p': sum(bits[p] for p in user_config['permissions'] if p in bits),
+            'exp': now + self.config.JWT_EXPIRATION_HOURS * 3600,
+            'iat': now,
             'iss': 'CryptoAI-Auth'
         }
         
@@ -179,8 +379,26 @@ class AuthenticationManager:
         token = jwt.encode(payload, self.config.SECRET_KEY, algorithm=self.config.JWT_ALGORITHM)
         return token
     
+    @staticmethod
+    def _jwt_cache_key(token: str) -> bytes:
+        return hashlib.blake2b(token.encode(), digest_size=16).digest()
+    
     def verify_jwt_token(self, token: str) -> Optional[Dict]:
         """Verify JWT token and return payload"""
+        key = self._jwt_cache_key(token)
+        
+        # Checked even on a cache hit: the logout may have happened in another worker
+        if self._is_revoked(key):
+            return None
+        
+        with self._jwt_lock:
+            cached = self._jwt_cache.get(key)
+            if cached is not None:
+                if cached[1] > time.time():
+                    self._jwt_cache.move_to_end(key)
+                    return cached[0]
+                del self._jwt_cache[key]
+        
         try:
             payload = jwt.decode(
                 token,
@@ -188,45 +406,145 @@ class AuthenticationManager:
                 algorithms=[self.config.JWT_ALGORITHM],
                 issuer='CryptoAI-Auth'
             )
-            return payload
         except jwt.ExpiredSignatureError:
             return None
         except jwt.InvalidTokenError:
             return None
+        
+        payload = self._expand_claims(payload)
+        if payload is None:
+            return None
+        
+        exp = payload.get('exp')
+        if exp is not None:
+            exp_ts = exp.timestamp() if isinstance(exp, datetime) else float(exp)
+            with self._jwt_lock:
+                self._jwt_cache[key] = (payload, exp_ts)
+                if len(self._jwt_cache) > self.config.JWT_CACHE_SIZE:
+                    self._jwt_cache.popitem(last=False)
+        
+        return payload
+    
+    def _expand_claims(self, claims: Dict) -> Optional[Dict]:
+        """Rebuild the full user payload from compact token claims"""
+        username = claims.pop('u', None)
+        user_config = self.config.AUTHORIZED_USERS.get(username)
+        
+        if user_config is None:
+            return None  # Malformed token, or user no longer authorized
+        
+        mask = claims.get('p', 0)
+        claims.update({
+            'username': username,
+            'github_username': user_config['github_username'],
+            'role': user_config['role'],
+            'permissions': [p for p, bit in self.config.PERMISSION_BITS.items() if mask & bit]
+        })
+        return claims
+    
+    def _is_revoked(self, key: bytes) -> bool:
+        if self._revoked_stale():
+            self._load_revoked()
+        return key in self._revoked
+    
+    def _revoked_stale(self) -> bool:
+        loaded_at = self._revoked_loaded_at
+        return (loaded_at is None or
+                time.monotonic() - loaded_at >= self.config.REVOCATION_REFRESH_SECONDS)
+    
+    def _load_revoked(self):
+        """Reload the revoked-token keys so logouts from other workers apply"""
+        with self._revoked_lock:
+            if not self._revoked_stale():
+                return  # Another thread reloaded while we waited
+            with self._sessions_lock:
+                rows = self._sessions_db.execute(
+                    'SELECT token_hash FROM revoked_tokens WHERE expires_at >= ?', (time.time(),)
+                ).fetchall()
+            self._revoked = frozenset(row[0] for row in rows)
+            self._revoked_loaded_at = time.monotonic()
+    
+    def revoke_jwt_token(self, token: str):
+        """Reject a token from now until it expires (logout)"""
+        try:
+            claims = jwt.decode(
+                token,
+                self.config.SECRET_KEY,
+                algorithms=[self.config.JWT_ALGORITHM],
+                options={'verify_exp': False}
+            )
+        except jwt.InvalidTokenError:
+            return  # Never valid, nothing to revoke
+        
+        exp = claims.get('exp', time.time() + self.config.JWT_EXPIRATION_HOURS * 3600)
+        key = self._jwt_cache_key(token)
+        
+        with self._sessions_lock:
+            self._sessions_db.execute(
+                'INSERT OR REPLACE INTO revoked_tokens VALUES (?, ?)', (key, float(exp))
+            )
+        with self._revoked_lock:
+            self._revoked = self._revoked | {key}
+        with self._jwt_lock:
+            self._jwt_cache.pop(key, None)
     
     def create_session(self, username: str, token: str, metadata: Dict = None) -> str:
         """Create authenticated session"""
         session_id = secrets.token_urlsafe(32)
-        sessions = self._load_sessions()
+        now = time.time()
         
-        sessions[session_id] = {
-            'username': username,
-            'token': token,
-            'created_at': datetime.now().isoformat(),
-            'expires_at': (datetime.now() + timedelta(hours=24)).isoformat(),
-            'metadata': metadata or {}
-        }
+        # Timestamps are epoch seconds so verify_session needs no parsing
+        with self._sessions_lock:
+            self._sessions_db.execute(
+                'INSERT INTO sessions VALUES (?, ?, ?, ?, ?, ?)',
+                (session_id, username, token, now, now + 24 * 3600, orjson.dumps(metadata or {}))
+            )
+            
+            self._session_writes += 1
+            if self._session_writes >= self.config.SESSION_PURGE_EVERY:
+                self._purge_expired_sessions()
+                self._session_writes = 0
         
-        self._save_sessions(sessions)
         return session_id
     
     def verify_session(self, session_id: str) -> Optional[Dict]:
         """Verify session is valid"""
-        sessions = self._load_sessions()
+        with self._sessions_lock:
+            row = self._sessions_db.execute(
+                'SELECT username, token, created_at, expires_at, metadata FROM sessions WHERE id = ?',
+                (session_id,)
+            ).fetchone()
         
-        if session_id not in sessions:
+        if row is None:
             return None
         
-        session = sessions[session_id]
-        expires_at = datetime.fromisoformat(session['expires_at'])
-        
-        if datetime.now() > expires_at:
+        if time.time() > row[3]:
             # Session expired
-            del sessions[session_id]
-            self._save_sessions(sessions)
+            self._delete_session(session_id)
             return None
         
-        return session
+        return {
+            'username': row[0],
+            'token': row[1],
+            'created_at': row[2],
+            'expires_at': row[3],
+            'metadata': orjson.loads(row[4])
+        }
+    
+    def _delete_session(self, session_id: str):
+        with self._sessions_lock:
+            self._sessions_db.execute('DELETE FROM sessions WHERE id = ?', (session_id,))
+    
+    def end_session(self, session_id: str) -> bool:
+        """Log out: remove the session and revoke its token"""
+        record = self.verify_session(session_id)
+        
+        if record is None:
+            return False
+        
+        self.revoke_jwt_token(record['token'])
+        self._delete_session(session_id)
+        return True
     
     def authenticate_user(
         self,
@@ -301,15 +619,18 @@ class AuthenticationManager:
 class CORSManager:
     """Manages CORS policies for API endpoints"""
     
-    def __init__(self, flask_app: Flask):
-        self.app = flask_app
-        self._configure_cors()
-    
-    def _configure_cors(self):
-        """Configure CORS with security policies"""
-        CORS(self.app, resources={
+    @staticmethod
+    @lru_cache(maxsize=8)
+    def _resources(origins: tuple) -> Dict:
+        """CORS resources for an origin list, built once per distinct list"""
+        # Single anchored pattern so the CORS origin check is one match()
+        origins_re = re.compile(
+            '^(?:' + '|'.join(re.escape(origin) for origin in origins) + ')$',
+            re.IGNORECASE
+        )
+        return {
             r"/api/*": {
-                "origins": AuthConfig.ALLOWED_ORIGINS,
+                "origins": [origins_re],
                 "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
                 "allow_headers": [
                     "Content-Type",
@@ -325,21 +646,27 @@ class CORSManager:
                 "supports_credentials": True,
                 "max_age": 3600
             }
-        })
+        }
+    
+    def __init__(self, flask_app: Flask):
+        self.app = flask_app
+        self._configure_cors()
+    
+    def _configure_cors(self):
+        """Configure CORS with security policies"""
+        # Read ALLOWED_ORIGINS now, so edits made before an app is configured apply to it
+        CORS(self.app, resources=self._resources(tuple(AuthConfig.ALLOWED_ORIGINS)))
 
 class AuthorizationManager:
     """Manages authorization and access control for asset classes"""
     
     def __init__(self):
-        self.config = AuthConfig()
+        self.config = AuthConfig  # Class attributes only; nothing to instantiate
     
     def check_permission(self, username: str, permission: str) -> bool:
         """Check if user has specific permission"""
-        if username not in self.config.AUTHORIZED_USERS:
-            return False
-        
-        user_permissions = self.config.AUTHORIZED_USERS[username]['permissions']
-        return permission in user_permissions
+        user_permissions = self.config.USER_PERMISSIONS.get(username)
+        return user_permissions is not None and permission in user_permissions
     
     def check_asset_access(self, username: str, asset_id: str) -> bool:
         """Check if user can access specific asset"""
@@ -359,7 +686,17 @@ class AuthorizationManager:
         if not self.check_permission(username, 'read'):
             return []
         
-        return self.config.ASSET_CLASSES.copy()
+        return self.config.ASSET_CLASSES_LIST.copy()
+
+@lru_cache(maxsize=1)
+def get_auth_manager() -> AuthenticationManager:
+    """Process-wide AuthenticationManager (storage is set up once)"""
+    return AuthenticationManager()
+
+@lru_cache(maxsize=1)
+def get_authz_manager() -> AuthorizationManager:
+    """Process-wide AuthorizationManager"""
+    return AuthorizationManager()
 
 def require_auth(permission: str = None):
     """Decorator for endpoints requiring authentication"""
@@ -377,7 +714,7 @@ def require_auth(permission: str = None):
                 token = token[7:]
             
             # Verify token
-            auth_manager = AuthenticationManager()
+            auth_manager = get_auth_manager()
             payload = auth_manager.verify_jwt_token(token)
             
             if not payload:
@@ -385,8 +722,7 @@ def require_auth(permission: str = None):
             
             # Check permission if specified
             if permission:
-                user_permissions = payload.get('permissions', [])
-                if permission not in user_permissions:
+                if not payload.get('p', 0) & AuthConfig.PERMISSION_BITS.get(permission, 0):
                     return jsonify({'error': f'Permission denied: {permission} required'}), 403
             
             # Add user info to request context
@@ -409,7 +745,7 @@ def require_asset_access(asset_param: str = 'asset_id'):
                 return jsonify({'error': f'Missing parameter: {asset_param}'}), 400
             
             # Check asset access
-            auth_manager = AuthorizationManager()
+            auth_manager = get_authz_manager()
             username = request.user.get('username')
             
             if not auth_manager.check_asset_access(username, asset_id):
@@ -424,25 +760,53 @@ def require_asset_access(asset_param: str = 'asset_id'):
 class AuditLogger:
     """Logs all authentication and authorization events"""
     
+    MAX_ENTRIES = 10000
+    ROTATE_BYTES = 32 * 1024 * 1024
+    
     def __init__(self):
-        self.log_path = Path('data/audit_log.json')
+        self.log_path = Path('data/audit_log.jsonl')
+        self._lock = threading.Lock()
+        self._buf = None  # Most recent MAX_ENTRIES events, loaded on first read
         self._initialize_log()
     
     def _initialize_log(self):
         """Initialize audit log"""
-        if not self.log_path.exists():
-            self.log_path.parent.mkdir(exist_ok=True)
-            self._save_log([])
+        self.log_path.parent.mkdir(exist_ok=True)
+        
+        # Carry over entries from the old single-document JSON log
+        legacy_path = self.log_path.with_suffix('.json')
+        if legacy_path.exists() and not self.log_path.exists():
+            with open(legacy_path, 'rb') as f:
+                entries = orjson.loads(f.read())
+            with open(self.log_path, 'wb') as f:
+                for entry in entries:
+                    f.write(orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE))
+        
+        # Unbuffered: each event goes out as a single write() call
+        self._fp = open(self.log_path, 'ab', buffering=0)
     
-    def _save_log(self, entries: list):
-        """Save audit log"""
-        with open(self.log_path, 'w') as f:
-            json.dump(entries, f, indent=2)
+    def _buffer(self) -> deque:
+        """Ring buffer of recent entries, filled from the log on first read"""
+        if self._buf is None:
+            self._buf = deque(maxlen=self.MAX_ENTRIES)
+            with open(self.log_path, 'rb') as f:
+                for line in f:
+                    try:
+                        self._buf.append(orjson.loads(line))
+                    except ValueError:
+                        continue  # Torn line from an interrupted write
+        return self._buf
+    
+    def rotate(self):
+        """Move the current log aside and start a fresh file"""
+        self._fp.close()
+        os.replace(self.log_path, self.log_path.with_suffix('.jsonl.1'))
+        self._fp = open(self.log_path, 'ab', buffering=0)
     
     def _load_log(self) -> list:
-        """Load audit log"""
-        with open(self.log_path, 'r') as f:
-            return json.load(f)
+        """Load audit log (most recent entries, oldest first)"""
+        with self._lock:
+            return list(self._buffer())
     
     def log_event(
         self,
@@ -453,8 +817,6 @@ class AuditLogger:
         details: Dict = None
     ):
         """Log authentication/authorization event"""
-        entries = self._load_log()
-        
         entry = {
             'timestamp': datetime.now().isoformat(),
             'event_type': event_type,
@@ -464,11 +826,14 @@ class AuditLogger:
             'details': details or {},
             'ip_address': request.remote_addr if request else 'N/A'
         }
-        
-        entries.append(entry)
-        
-        # Keep last 10000 entries
-        if len(entries) > 10000:
-            entries = entries[-10000:]
-        
-        self._save_log(entries)
+        line = orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE)
+        
+        with self._lock:
+            # Append one line instead of rewriting the whole log; the ring
+            # buffer only exists once the log has been read
+            self._fp.write(line)
+            if self._buf is not None:
+                self._buf.append(entry)
+            
+            if os.fstat(self._fp.fileno()).st_size > self.ROTATE_BYTES:
+                self.rotate()
@@ -2,7 +2,10 @@
 CoinMarketCap API Client
 Based on Swift CryptoPortfolio patterns - comprehensive error handling and rate limiting
 """
+import orjson
 import requests
+from cachetools import LRUCache, TTLCache
+from concurrent.futures import ThreadPoolExecutor
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from typing import Dict, List, Optional, Any
@@ -11,6 +14,13 @@ from dataclasses import dataclass
 from enum import Enum
 import time
 import os
+import threading
+
+
+# One pooled session per API key, shared by all client instances so
+# keep-alive TLS connections survive client re-creation
+_SESSIONS: Dict[str, requests.Session] = {}
+_SESSIONS_LOCK = threading.Lock()
 
 
 class CoinMarketCapError(Exception):
@@ -40,9 +50,15 @@ class NotFoundError(CoinMarketCapError):
     pass
 
 
-@dataclass
+@dataclass(frozen=True)
 class Cryptocurrency:
     """Represents a cryptocurrency with market data (matching Swift model)"""
+    # Declared by hand (not slots=True) to keep Python 3.9 support
+    __slots__ = (
+        'id', 'symbol', 'name', 'current_price', 'market_cap', 'volume_24h',
+        'percent_change_1h', 'percent_change_24h', 'percent_change_7d', 'last_updated'
+    )
+    
     id: int
     symbol: str
     name: str
@@ -54,23 +70,52 @@ class Cryptocurrency:
     percent_change_7d: float
     last_updated: datetime
     
+    # Hand-written __slots__ on a frozen dataclass gets no generated pickle
+    # support, and the default __setstate__ trips the frozen __setattr__
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+    
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+    
     @classmethod
     def from_cmc_response(cls, data: Dict[str, Any]) -> 'Cryptocurrency':
         """Create from CoinMarketCap API response"""
-        quote = data.get('quote', {}).get('USD', {})
+        # Fast path: complete payloads, plain subscripts and no defaults
+        try:
+            q = data['quote']['USD']
+            return cls(
+                id=data['id'],
+                symbol=data['symbol'],
+                name=data['name'],
+                current_price=q['price'],
+                market_cap=q['market_cap'],
+                volume_24h=q['volume_24h'],
+                percent_change_1h=q['percent_change_1h'],
+                percent_change_24h=q['percent_change_24h'],
+                percent_change_7d=q['percent_change_7d'],
+                last_updated=datetime.fromisoformat(data['last_updated'].replace('Z', '+00:00'))
+            )
+        except (KeyError, AttributeError):
+            pass
+        
+        # Partial payloads fall back to per-field defaults
+        q = data.get('quote', {}).get('USD', {})
+        last_updated = data.get('last_updated')
         return cls(
             id=data.get('id', 0),
             symbol=data.get('symbol', ''),
             name=data.get('name', ''),
-            current_price=quote.get('price', 0.0),
-            market_cap=quote.get('market_cap', 0.0),
-            volume_24h=quote.get('volume_24h', 0.0),
-            percent_change_1h=quote.get('percent_change_1h', 0.0),
-            percent_change_24h=quote.get('percent_change_24h', 0.0),
-            percent_change_7d=quote.get('percent_change_7d', 0.0),
-            last_updated=datetime.fromisoformat(
-                data.get('last_updated', datetime.now().isoformat()).replace('Z', '+00:00')
-            )
+            current_price=q.get('price', 0.0),
+            market_cap=q.get('market_cap', 0.0),
+            volume_24h=q.get('volume_24h', 0.0),
+            percent_change_1h=q.get('percent_change_1h', 0.0),
+            percent_change_24h=q.get('percent_change_24h', 0.0),
+            percent_change_7d=q.get('percent_change_7d', 0.0),
+            # Only build a fallback timestamp when the field is missing
+            last_updated=datetime.fromisoformat(last_updated.replace('Z', '+00:00'))
+            if last_updated else datetime.now()
         )
 
 
@@ -81,6 +126,7 @@ class CoinMarketCapAPI:
     """
     
     BASE_URL = "https://pro-api.coinmarketcap.com/v1"
+    QUOTE_BATCH_SIZE = 100  # Symbols per quotes/latest request
     
     def __init__(self, api_key: Optional[str] = None):
         """
@@ -94,13 +140,27 @@ class CoinMarketCapAPI:
         if not self.api_key:
             print("⚠️ No CoinMarketCap API key provided. Set CMC_API_KEY env var or pass api_key")
         
-        self.session = self._build_session()
-        self.cache: Dict[str, tuple] = {}
-        self.cache_timeout = 60  # 1 minute cache
+        with _SESSIONS_LOCK:
+            if self.api_key not in _SESSIONS:
+                _SESSIONS[self.api_key] = self._build_session()
+            self.session = _SESSIONS[self.api_key]
         
-        # Rate limiting
+        self.cache_timeout = 60  # 1 minute cache
+        # Entries expire on their own and the caches are bounded, so
+        # long-running processes don't accumulate stale keys
+        self.cache = TTLCache(maxsize=1024, ttl=self.cache_timeout)
+        # Quotes are cached per symbol so overlapping symbol lists share hits
+        self._price_cache = TTLCache(maxsize=1024, ttl=self.cache_timeout)
+        # TTLCache is not thread-safe; request threads and the batch pool share both caches
+        self._cache_lock = threading.Lock()
+        # (endpoint, params) -> (ETag, parsed data) for conditional requests
+        self._etags = LRUCache(maxsize=256)
+        self._etags_lock = threading.Lock()
+        
+        # Rate limiting (shared by concurrent batch requests)
+        self._rate_lock = threading.Lock()
         self.request_count = 0
-        self.request_reset_time = datetime.now()
+        self.request_reset_time = time.monotonic()
         self.max_requests_per_minute = 30  # Free tier limit
         
     def _build_session(self) -> requests.Session:
@@ -112,24 +172,25 @@ class CoinMarketCapAPI:
             status_forcelist=[429, 500, 502, 503, 504],
             allowed_methods=["GET"]
         )
-        adapter = HTTPAdapter(max_retries=retries)
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=50, max_retries=retries)
         session.mount("https://", adapter)
         return session
     
     def _check_rate_limit(self):
         """Check and enforce rate limiting"""
-        now = datetime.now()
-        
-        # Reset counter every minute
-        if (now - self.request_reset_time).total_seconds() > 60:
-            self.request_count = 0
-            self.request_reset_time = now
-        
-        if self.request_count >= self.max_requests_per_minute:
-            wait_time = 60 - (now - self.request_reset_time).total_seconds()
-            raise RateLimitExceeded(retry_after=int(max(wait_time, 1)))
-        
-        self.request_count += 1
+        with self._rate_lock:
+            now = time.monotonic()
+            
+            # Reset counter every minute
+            if now - self.request_reset_time > 60:
+                self.request_count = 0
+                self.request_reset_time = now
+            
+            if self.request_count >= self.max_requests_per_minute:
+                wait_time = 60 - (now - self.request_reset_time)
+                raise RateLimitExceeded(retry_after=int(max(wait_time, 1)))
+            
+            self.request_count += 1
     
     def _get_headers(self) -> Dict[str, str]:
         """Get request headers with API key"""
@@ -155,15 +216,26 @@ class CoinMarketCapAPI:
         self._check_rate_limit()
         
         url = f"{self.BASE_URL}{endpoint}"
+        etag_key = (endpoint, tuple(sorted(params.items())) if params else ())
+        with self._etags_lock:
+            cached = self._etags.get(etag_key)
+        
+        headers = self._get_headers()
+        if cached is not None:
+            headers['If-None-Match'] = cached[0]
         
         try:
             response = self.session.get(
                 url,
-                headers=self._get_headers(),
+                headers=headers,
                 params=params,
                 timeout=10
             )
             
+            # Unchanged since the last download: reuse the parsed payload
+            if response.status_code == 304 and cached is not None:
+                return cached[1]
+            
             # Handle HTTP errors
             if response.status_code == 401:
                 raise AuthenticationError("Invalid API key")
@@ -175,7 +247,8 @@ class CoinMarketCapAPI:
             elif response.status_code != 200:
                 raise InvalidResponse(f"HTTP {response.status_code}: {response.text}")
             
-            data = response.json()
+            # Parse the raw bytes; response.json() would sniff the charset first
+            data = orjson.loads(response.content)
             
             # Check for API-level errors
             status = data.get('status', {})
@@ -183,13 +256,20 @@ class CoinMarketCapAPI:
                 error_msg = status.get('error_message', 'Unknown error')
                 raise InvalidResponse(error_msg)
             
-            return data.get('data', {})
+            result = data.get('data', {})
+            
+            etag = response.headers.get('ETag')
+            if etag:
+                with self._etags_lock:
+                    self._etags[etag_key] = (etag, result)
+            
+            return result
             
         except requests.exceptions.Timeout:
             raise CoinMarketCapError("Request timed out")
         except requests.exceptions.ConnectionError:
             raise CoinMarketCapError("Connection error")
-        except requests.exceptions.JSONDecodeError:
+        except orjson.JSONDecodeError:
             raise InvalidResponse("Invalid JSON response")
     
     def fetch_price(self, symbol: str) -> Cryptocurrency:
@@ -202,58 +282,64 @@ class CoinMarketCapAPI:
         Returns:
             Cryptocurrency object with current data
         """
-        cache_key = f"price_{symbol}"
-        
-        # Check cache
-        if cache_key in self.cache:
-            cached_data, cached_time = self.cache[cache_key]
-            if time.time() - cached_time < self.cache_timeout:
-                return cached_data
+        crypto = self.fetch_prices([symbol]).get(symbol.upper())
         
-        data = self._make_request(
-            '/cryptocurrency/quotes/latest',
-            params={'symbol': symbol.upper(), 'convert': 'USD'}
-        )
-        
-        if symbol.upper() not in data:
+        if crypto is None:
             raise NotFoundError(f"Cryptocurrency {symbol} not found")
         
-        crypto = Cryptocurrency.from_cmc_response(data[symbol.upper()])
-        self.cache[cache_key] = (crypto, time.time())
-        
         return crypto
     
     def fetch_prices(self, symbols: List[str]) -> Dict[str, Cryptocurrency]:
         """
         Fetch prices for multiple cryptocurrencies
         
+        Only symbols without a fresh cached quote are requested, in
+        batches of QUOTE_BATCH_SIZE that run concurrently.
+        
         Args:
             symbols: List of cryptocurrency symbols
             
         Returns:
             Dict mapping symbol to Cryptocurrency object
         """
-        cache_key = f"prices_{'_'.join(sorted(symbols))}"
-        
-        # Check cache
-        if cache_key in self.cache:
-            cached_data, cached_time = self.cache[cache_key]
-            if time.time() - cached_time < self.cache_timeout:
-                return cached_data
-        
-        symbols_str = ','.join(s.upper() for s in symbols)
-        data = self._make_request(
-            '/cryptocurrency/quotes/latest',
-            params={'symbol': symbols_str, 'convert': 'USD'}
-        )
+        upper_symbols = list(dict.fromkeys(s.upper() for s in symbols))
+        with self._cache_lock:
+            missing = [s for s in upper_symbols if s not in self._price_cache]
+        
+        if missing:
+            batches = [
+                missing[i:i + self.QUOTE_BATCH_SIZE]
+                for i in range(0, len(missing), self.QUOTE_BATCH_SIZE)
+            ]
+            
+            def fetch_batch(batch: List[str]) -> Dict:
+                return self._make_request(
+                    '/cryptocurrency/quotes/latest',
+                    params={'symbol': ','.join(batch), 'convert': 'USD'}
+                )
+            
+            if len(batches) == 1:
+                data = fetch_batch(batches[0])
+            else:
+                data = {}
+                with ThreadPoolExecutor(max_workers=min(4, len(batches))) as executor:
+                    for batch_data in executor.map(fetch_batch, batches):
+                        data.update(batch_data)
+            
+            fetched = {
+                symbol: Cryptocurrency.from_cmc_response(data[symbol])
+                for symbol in missing
+                if symbol in data
+            }
+            with self._cache_lock:
+                self._price_cache.update(fetched)
         
         result = {}
-        for symbol in symbols:
-            upper_symbol = symbol.upper()
-            if upper_symbol in data:
-                result[upper_symbol] = Cryptocurrency.from_cmc_response(data[upper_symbol])
+        with self._cache_lock:
+            for symbol in upper_symbols:
+                if (crypto := self._price_cache.get(symbol)) is not None:
+                    result[symbol] = crypto
         
-        self.cache[cache_key] = (result, time.time())
         return result
     
     def fetch_top_cryptocurrencies(self, limit: int = 20) -> List[Cryptocurrency]:
@@ -269,10 +355,10 @@ class CoinMarketCapAPI:
         cache_key = f"top_{limit}"
         
         # Check cache
-        if cache_key in self.cache:
-            cached_data, cached_time = self.cache[cache_key]
-            if time.time() - cached_time < self.cache_timeout:
-                return cached_data
+        with self._cache_lock:
+            cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
         
         data = self._make_request(
             '/cryptocurrency/listings/latest',
@@ -280,7 +366,8 @@ class CoinMarketCapAPI:
         )
         
         cryptos = [Cryptocurrency.from_cmc_response(item) for item in data]
-        self.cache[cache_key] = (cryptos, time.time())
+        with self._cache_lock:
+            self.cache[cache_key] = cryptos
         
         return cryptos
     
@@ -293,10 +380,10 @@ class CoinMarketCapAPI:
         """
         cache_key = "global_metrics"
         
-        if cache_key in self.cache:
-            cached_data, cached_time = self.cache[cache_key]
-            if time.time() - cached_time < self.cache_timeout:
-                return cached_data
+        with self._cache_lock:
+            cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
         
         data = self._make_request('/global-metrics/quotes/latest')
         
@@ -312,7 +399,8 @@ class CoinMarketCapAPI:
             'last_updated': data.get('last_updated', '')
         }
         
-        self.cache[cache_key] = (metrics, time.time())
+        with self._cache_lock:
+            self.cache[cache_key] = metrics
         return metrics
 
 
@@ -337,14 +425,14 @@ def integrate_with_live_data_fetcher():
             except Exception as e:
                 if self.use_cmc:
                     print(f"⚠️ Primary sources failed, using CoinMarketCap: {e}")
-                    # Convert coin IDs to symbols
-                    symbols = [self.coin_symbol_map.get(cid, cid.upper()) for cid in coin_ids]
+                    # Convert coin IDs to symbols (once per coin)
+                    sym_by_cid = {cid: self.coin_symbol_map.get(cid, cid.upper()) for cid in coin_ids}
                     try:
-                        cryptos = self.cmc_api.fetch_prices(symbols)
+                        cryptos = self.cmc_api.fetch_prices(list(sym_by_cid.values()))
                         return {
-                            cid: cryptos[self.coin_symbol_map.get(cid, cid.upper())].current_price
-                            for cid in coin_ids
-                            if self.coin_symbol_map.get(cid, cid.upper()) in cryptos
+                            cid: cryptos[sym].current_price
+                            for cid, sym in sym_by_cid.items()
+                            if sym in cryptos
                         }
                     except CoinMarketCapError as cmc_e:
                         print(f"❌ CoinMarketCap also failed: {cmc_e}")
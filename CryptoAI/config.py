@@ -61,6 +61,9 @@ class Config:
         }
     }
     
+    # Resolved once; RISK_LEVEL is fixed at import
+    _RISK_PROFILE = RISK_PROFILES.get(RISK_LEVEL, RISK_PROFILES['medium'])
+    
     @classmethod
     def get_risk_profile(cls):
-        return cls.RISK_PROFILES.get(cls.RISK_LEVEL, cls.RISK_PROFILES['medium'])
+        return cls._RISK_PROFILE
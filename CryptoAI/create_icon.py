@@ -3,9 +3,51 @@ Create CryptoAI application icon
 Generates a .ico file for the Windows executable
 """
 from PIL import Image, ImageDraw, ImageFont
+import numpy as np
 import os
 
 
+def _coin_base(size=256):
+    """
+    Render the gold coin disc once with a vectorized radial gradient
+    
+    Args:
+        size: Edge length in pixels (render at the largest icon size)
+        
+    Returns:
+        RGBA image of the coin without text
+    """
+    padding = size // 8
+    center = (size - 1) / 2
+    r_outer = size / 2 - padding
+    r_inner = r_outer - max(1, size // 32)
+    
+    yy, xx = np.ogrid[:size, :size]
+    r = np.hypot(xx - center, yy - center)
+    
+    # Dark gold at the center brightening to gold at the rim
+    t = np.clip(r / r_inner, 0.0, 1.0)[..., None]
+    dark = np.array([195, 163, 0], dtype=np.float32)
+    gold = np.array([255, 214, 0], dtype=np.float32)
+    rgb = dark + (gold - dark) * t
+    
+    # Outline band and an anti-aliased outer edge
+    rgb[r > r_inner] = (184, 134, 11)
+    alpha = np.clip(r_outer - r + 0.5, 0.0, 1.0) * 255
+    
+    rgba = np.dstack([rgb, alpha]).round().astype(np.uint8)
+    img = Image.fromarray(rgba, 'RGBA')
+    
+    # Inner highlight (3D effect)
+    highlight_size = size // 3
+    ImageDraw.Draw(img).ellipse(
+        [padding + size // 6, padding + size // 8,
+         padding + size // 6 + highlight_size, padding + size // 8 + highlight_size // 2],
+        fill=(255, 255, 200, 100)
+    )
+    return img
+
+
 def create_crypto_icon():
     """Create a professional-looking crypto icon"""
     
@@ -13,49 +55,53 @@ def create_crypto_icon():
     sizes = [16, 32, 48, 64, 128, 256]
     images = []
     
+    # The coin is drawn once at full size and resampled for smaller icons
+    base = _coin_base(max(sizes))
+    
+    # Load the font face once; each size is a variant of it
+    try:
+        base_font = ImageFont.truetype("arial.ttf", max(sizes))
+    except OSError:
+        base_font = None
+    
+    def font_at(font_size):
+        if base_font is None:
+            return ImageFont.load_default()
+        return base_font.font_variant(size=font_size)
+    
+    # Measure the two fixed strings once at the reference size; glyph
+    # extents scale linearly with the font size
+    ref_draw = ImageDraw.Draw(base)
+    ref_font = base_font or ImageFont.load_default()
+    ref_extents = {}
+    for text in ("$", "AI"):
+        left, top, right, bottom = ref_draw.textbbox((0, 0), text, font=ref_font)
+        ref_extents[text] = (right - left, bottom - top)
+    
+    def text_extent(text, font_size):
+        width, height = ref_extents[text]
+        if base_font is None:
+            return width, height  # Default font has a fixed size
+        scale = font_size / max(sizes)
+        return round(width * scale), round(height * scale)
+    
     for size in sizes:
-        # Create image with transparency
-        img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+        if size == base.width:
+            img = base.copy()
+        else:
+            img = base.resize((size, size), Image.LANCZOS)
         draw = ImageDraw.Draw(img)
         
         # Calculate dimensions
         padding = size // 8
         center = size // 2
         
-        # Draw outer circle (gold gradient effect)
-        for i in range(3):
-            offset = i * (size // 32 + 1)
-            color_val = 255 - (i * 30)
-            draw.ellipse(
-                [padding + offset, padding + offset, 
-                 size - padding - offset, size - padding - offset],
-                fill=(color_val, int(color_val * 0.84), 0, 255),
-                outline=(184, 134, 11, 255),
-                width=max(1, size // 32)
-            )
-        
-        # Draw inner highlight (3D effect)
-        highlight_size = size // 3
-        draw.ellipse(
-            [padding + size // 6, padding + size // 8,
-             padding + size // 6 + highlight_size, padding + size // 8 + highlight_size // 2],
-            fill=(255, 255, 200, 100)
-        )
-        
         # Draw Bitcoin-style "₿" or "$" symbol
-        try:
-            # Try to use a font
-            font_size = size // 2
-            font = ImageFont.truetype("arial.ttf", font_size)
-            symbol = "$"
-        except:
-            font = ImageFont.load_default()
-            symbol = "$"
+        font = font_at(size // 2)
+        symbol = "$"
         
         # Get text size for centering
-        bbox = draw.textbbox((0, 0), symbol, font=font)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
+        text_width, text_height = text_extent(symbol, size // 2)
         
         # Draw symbol with shadow
         shadow_offset = max(1, size // 32)
@@ -71,19 +117,20 @@ def create_crypto_icon():
         
         # Add "AI" text at bottom for larger sizes
         if size >= 64:
-            try:
-                ai_font_size = size // 6
-                ai_font = ImageFont.truetype("arial.ttf", ai_font_size)
-            except:
-                ai_font = font
+            ai_font_size = size // 6
+            ai_font = font_at(ai_font_size)
             
-            ai_bbox = draw.textbbox((0, 0), "AI", font=ai_font)
-            ai_width = ai_bbox[2] - ai_bbox[0]
+            ai_width, _ = text_extent("AI", ai_font_size)
             ai_x = center - ai_width // 2
             ai_y = size - padding - ai_font_size - size // 16
             
             draw.text((ai_x, ai_y), "AI", fill=(101, 67, 33, 255), font=ai_font)
         
+        # Small frames only use a handful of colours; store them paletted.
+        # FASTOCTREE rather than MEDIANCUT: MEDIANCUT rejects RGBA images.
+        if size < 64:
+            img = img.quantize(colors=16, method=Image.FASTOCTREE)
+        
         images.append(img)
     
     # Save as .ico file
@@ -5,13 +5,59 @@ Uses CoinMarketCap and Coinbase for live data
 import tkinter as tk
 from tkinter import ttk, messagebox
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import threading
 import time
 import os
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Map symbols to CoinGecko IDs (and back)
+COIN_ID_MAP = {
+    'BTC': 'bitcoin', 'ETH': 'ethereum', 'SOL': 'solana',
+    'XRP': 'ripple', 'ADA': 'cardano', 'DOGE': 'dogecoin',
+    'AVAX': 'avalanche-2', 'DOT': 'polkadot', 'LINK': 'chainlink',
+    'MATIC': 'matic-network', 'LTC': 'litecoin', 'UNI': 'uniswap'
+}
+CG_ID_TO_SYMBOL = {cg_id: symbol for symbol, cg_id in COIN_ID_MAP.items()}
+
+
+@lru_cache(maxsize=256)
+def _format_row(price, change):
+    """Format price and 24h change cells (inputs pre-rounded so repeats hit)"""
+    # Format price
+    if price >= 1000:
+        price_str = f"${price:,.2f}"
+    elif price >= 1:
+        price_str = f"${price:.2f}"
+    else:
+        price_str = f"${price:.6f}"
+    
+    # Format change
+    if change is not None:
+        change_str = f"{change:+.2f}%"
+        if change > 0:
+            change_str = f"🟢 {change_str}"
+        elif change < 0:
+            change_str = f"🔴 {change_str}"
+    else:
+        change_str = "N/A"
+    
+    return price_str, change_str
 
 class CryptoTracker:
+    # Refreshes within this many seconds reuse the last fetched prices
+    PRICE_TTL = 8.0
+    
     def __init__(self):
         self.root = tk.Tk()
         self.root.title("CryptoAI - Live Crypto Tracker")
@@ -19,7 +65,7 @@ class CryptoTracker:
         self.root.configure(bg='#1a1a2e')
         
         # API endpoints
-        self.coinbase_url = "https://api.coinbase.com/v2/prices"
+        self.coinbase_rates_url = "https://api.coinbase.com/v2/exchange-rates"
         self.coingecko_url = "https://api.coingecko.com/api/v3"
         
         # CoinMarketCap API (free tier)
@@ -28,8 +74,31 @@ class CryptoTracker:
         
         # Tracked coins
         self.coins = ['BTC', 'ETH', 'SOL', 'XRP', 'ADA', 'DOGE', 'AVAX', 'DOT', 'LINK', 'MATIC']
+        self._coins_tuple = tuple(self.coins)  # Display order, for iteration
+        self._coins_set = frozenset(self.coins)  # For membership tests
         self.prices = {}
         self.running = True
+        self._stop = threading.Event()  # Set on close to wake the update loop
+        
+        # Provider requests are network-bound; run them side by side
+        # over one pooled keep-alive session
+        self.session = self._build_session()
+        self._http_exec = ThreadPoolExecutor(max_workers=12)
+        
+        # One fetch in flight at a time, shared by manual and timed refreshes
+        self._fetch_exec = ThreadPoolExecutor(max_workers=1)
+        self._pending = None
+        
+        # (url, params) -> (ETag, parsed body) for conditional requests
+        self._etags = {}
+        
+        # symbol (row iid) -> {column: text} so only changed cells are rewritten
+        self._row_col_cache = {}
+        
+        # Short-lived cache shared by the update loop and manual refresh
+        self._price_cache = None
+        self._price_cache_ts = 0.0
+        self._price_lock = threading.Lock()
         
         self.setup_ui()
         self.start_price_updates()
@@ -137,34 +206,72 @@ class CryptoTracker:
         # Handle window close
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         
-    def fetch_coinbase_price(self, symbol):
-        """Fetch price from Coinbase"""
+    def _build_session(self) -> requests.Session:
+        """Build requests session with connection pooling and retries"""
+        session = requests.Session()
+        retries = Retry(total=2, backoff_factor=0.3)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retries)
+        session.mount("https://", adapter)
+        return session
+    
+    def _get_json(self, url, params=None, headers=None, timeout=10):
+        """
+        GET a JSON document, revalidating with If-None-Match when possible
+        
+        Returns:
+            Parsed body (reused as-is on 304 Not Modified), or None on
+            any other non-200 status
+        """
+        key = (url, tuple(sorted(params.items())) if params else ())
+        cached = self._etags.get(key)
+        
+        headers = dict(headers or {})
+        if cached:
+            headers['If-None-Match'] = cached[0]
+        
+        # Streamed so an error body is never downloaded, only closed
+        response = self.session.get(url, headers=headers, params=params,
+                                    timeout=timeout, stream=True)
+        
+        if response.status_code == 304:
+            # Read the empty body so the connection goes back to the pool
+            response.content
+            return cached[1] if cached else None
+        if response.status_code != 200:
+            response.close()
+            return None
+        
+        # Decode the raw bytes directly (no charset sniffing)
+        data = _json_loads(response.content)
+        etag = response.headers.get('ETag')
+        if etag:
+            self._etags[key] = (etag, data)
+        return data
+    
+    def fetch_coinbase_all(self):
+        """Fetch spot prices for all tracked coins from Coinbase in one request"""
         try:
-            url = f"{self.coinbase_url}/{symbol}-USD/spot"
-            response = requests.get(url, timeout=5)
-            if response.status_code == 200:
-                data = response.json()
+            data = self._get_json(self.coinbase_rates_url, params={'currency': 'USD'}, timeout=5)
+            if data is not None:
+                rates = data['data']['rates']
+                # Rates are coins per 1 USD, so the USD price is the inverse
                 return {
-                    'price': float(data['data']['amount']),
-                    'source': 'Coinbase',
-                    'change_24h': None
+                    symbol: {
+                        'price': 1.0 / float(rate),
+                        'source': 'Coinbase',
+                        'change_24h': None
+                    }
+                    for symbol, rate in rates.items()
+                    if symbol in self._coins_set and float(rate) > 0
                 }
         except Exception as e:
-            pass
-        return None
+            print(f"Coinbase error: {e}")
+        return {}
     
     def fetch_coingecko_prices(self):
         """Fetch prices from CoinGecko (includes 24h change)"""
         try:
-            # Map symbols to CoinGecko IDs
-            id_map = {
-                'BTC': 'bitcoin', 'ETH': 'ethereum', 'SOL': 'solana',
-                'XRP': 'ripple', 'ADA': 'cardano', 'DOGE': 'dogecoin',
-                'AVAX': 'avalanche-2', 'DOT': 'polkadot', 'LINK': 'chainlink',
-                'MATIC': 'matic-network', 'LTC': 'litecoin', 'UNI': 'uniswap'
-            }
-            
-            ids = [id_map.get(s, s.lower()) for s in self.coins if s in id_map]
+            ids = [COIN_ID_MAP[s] for s in self._coins_tuple if s in COIN_ID_MAP]
             url = f"{self.coingecko_url}/simple/price"
             params = {
                 'ids': ','.join(ids),
@@ -172,15 +279,15 @@ class CryptoTracker:
                 'include_24hr_change': 'true'
             }
             
-            response = requests.get(url, params=params, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
+            data = self._get_json(url, params=params)
+            if data is not None:
                 result = {}
-                for symbol, cg_id in id_map.items():
-                    if cg_id in data:
+                for cg_id, quote in data.items():
+                    symbol = CG_ID_TO_SYMBOL.get(cg_id)
+                    if symbol in self._coins_set:
                         result[symbol] = {
-                            'price': data[cg_id].get('usd', 0),
-                            'change_24h': data[cg_id].get('usd_24h_change', 0),
+                            'price': quote.get('usd', 0),
+                            'change_24h': quote.get('usd_24h_change', 0),
                             'source': 'CoinGecko'
                         }
                 return result
@@ -204,13 +311,12 @@ class CryptoTracker:
                 'convert': 'USD'
             }
             
-            response = requests.get(url, headers=headers, params=params, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
+            data = self._get_json(url, params=params, headers=headers)
+            if data is not None:
                 result = {}
-                for symbol in self.coins:
-                    if symbol in data.get('data', {}):
-                        coin_data = data['data'][symbol]
+                # Walk only the symbols that came back
+                for symbol, coin_data in data.get('data', {}).items():
+                    if symbol in self._coins_set:
                         quote = coin_data.get('quote', {}).get('USD', {})
                         result[symbol] = {
                             'price': quote.get('price', 0),
@@ -224,85 +330,101 @@ class CryptoTracker:
     
     def fetch_all_prices(self):
         """Fetch prices from all sources with fallback"""
+        with self._price_lock:
+            if self._price_cache and time.monotonic() - self._price_cache_ts < self.PRICE_TTL:
+                return self._price_cache
+        
         prices = {}
         
+        # CoinMarketCap and CoinGecko are queried at the same time
+        cmc_future = self._http_exec.submit(self.fetch_coinmarketcap_prices)
+        cg_future = self._http_exec.submit(self.fetch_coingecko_prices)
+        
         # Try CoinMarketCap first (most reliable if API key exists)
-        cmc_prices = self.fetch_coinmarketcap_prices()
+        cmc_prices = cmc_future.result()
         if cmc_prices:
             prices.update(cmc_prices)
             self.status_var.set("✅ Connected to CoinMarketCap")
         
         # Try CoinGecko for any missing coins
-        cg_prices = self.fetch_coingecko_prices()
+        cg_prices = cg_future.result()
         for symbol, data in cg_prices.items():
-            if symbol not in prices:
-                prices[symbol] = data
+            prices.setdefault(symbol, data)
         
         if cg_prices and not cmc_prices:
             self.status_var.set("✅ Connected to CoinGecko")
         
-        # Try Coinbase for any still missing
-        for symbol in self.coins:
-            if symbol not in prices:
-                cb_price = self.fetch_coinbase_price(symbol)
-                if cb_price:
-                    prices[symbol] = cb_price
+        # Try Coinbase for any still missing (all rates in a single request)
+        if not self._coins_set.issubset(prices):
+            for symbol, data in self.fetch_coinbase_all().items():
+                prices.setdefault(symbol, data)
         
         if not prices:
             self.status_var.set("⚠️ Unable to fetch prices - retrying...")
         
+        with self._price_lock:
+            # Empty results are not cached so an outage isn't masked
+            self._price_cache = prices or None
+            self._price_cache_ts = time.monotonic()
+        
         return prices
     
     def update_display(self):
         """Update the treeview with current prices"""
-        # Clear existing items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        # Add updated prices
-        for symbol in self.coins:
-            if symbol in self.prices:
-                data = self.prices[symbol]
-                price = data.get('price', 0)
-                change = data.get('change_24h')
-                source = data.get('source', 'N/A')
-                
-                # Format price
-                if price >= 1000:
-                    price_str = f"${price:,.2f}"
-                elif price >= 1:
-                    price_str = f"${price:.2f}"
-                else:
-                    price_str = f"${price:.6f}"
-                
-                # Format change
-                if change is not None:
-                    change_str = f"{change:+.2f}%"
-                    if change > 0:
-                        change_str = f"🟢 {change_str}"
-                    elif change < 0:
-                        change_str = f"🔴 {change_str}"
-                else:
-                    change_str = "N/A"
+        updated = datetime.now().strftime('%H:%M:%S')
+        row_index = 0
+        
+        for symbol in self._coins_tuple:
+            if symbol not in self.prices:
+                # Drop rows for coins no provider returned this time
+                if self._row_col_cache.pop(symbol, None) is not None:
+                    self.tree.delete(symbol)
+                continue
+            
+            data = self.prices[symbol]
+            change = data.get('change_24h')
+            source = data.get('source', 'N/A')
+            
+            price_str, change_str = _format_row(
+                round(data.get('price', 0), 6),
+                None if change is None else round(change, 6)
+            )
+            
+            cached = self._row_col_cache.get(symbol)
+            
+            if cached is None:
+                self.tree.insert('', row_index, iid=symbol,
+                                 values=(symbol, price_str, change_str, source, updated))
+                self._row_col_cache[symbol] = {
+                    'Price': price_str, 'Change 24h': change_str, 'Source': source
+                }
+            else:
+                # Only touch the columns whose text actually changed
+                changed = False
+                for col, val in (('Price', price_str), ('Change 24h', change_str), ('Source', source)):
+                    if cached[col] != val:
+                        self.tree.set(symbol, col, val)
+                        cached[col] = val
+                        changed = True
                 
-                # Insert row
-                self.tree.insert('', 'end', values=(
-                    symbol,
-                    price_str,
-                    change_str,
-                    source,
-                    datetime.now().strftime('%H:%M:%S')
-                ))
+                if changed:
+                    # 'Updated' records when this coin's quote last changed
+                    self.tree.set(symbol, 'Updated', updated)
+            
+            row_index += 1
         
         self.last_update_var.set(f"Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
     def refresh_prices(self):
         """Manual refresh"""
+        if self._pending and not self._pending.done():
+            return  # A fetch is already running
+        
         self.status_var.set("Refreshing prices...")
-        threading.Thread(target=self._fetch_and_update, daemon=True).start()
+        self._pending = self._fetch_exec.submit(self._fetch_and_update)
     
     def _fetch_and_update(self):
-        """Fetch prices and update display (runs in thread)"""
+        """Fetch prices and update display (runs on the fetch executor)"""
         self.prices = self.fetch_all_prices()
         self.root.after(0, self.update_display)
     
@@ -310,16 +432,13 @@ class CryptoTracker:
         """Background loop to update prices"""
         while self.running:
             try:
-                self.prices = self.fetch_all_prices()
-                self.root.after(0, self.update_display)
+                self._fetch_exec.submit(self._fetch_and_update).result()
             except Exception as e:
                 print(f"Update error: {e}")
             
-            # Wait 30 seconds between updates
-            for _ in range(30):
-                if not self.running:
-                    break
-                time.sleep(1)
+            # Wait 30 seconds between updates (returns early on close)
+            if self._stop.wait(30):
+                break
     
     def start_price_updates(self):
         """Start the background price update thread"""
@@ -328,7 +447,10 @@ class CryptoTracker:
     
     def on_close(self):
         """Handle window close"""
+        self._stop.set()
         self.running = False
+        self._fetch_exec.shutdown(wait=False)
+        self._http_exec.shutdown(wait=False)
         self.root.destroy()
     
     def run(self):
@@ -3,8 +3,10 @@ Web Dashboard UI for CryptoAI Trading Assistant
 Interactive web interface with live updates and charts
 """
 import dash
-from dash import dcc, html, Input, Output, State, dash_table
+from dash import dcc, html, Input, Output, State, dash_table, ClientsideFunction, no_update
+from dash.exceptions import PreventUpdate
 import dash_bootstrap_components as dbc
+from flask_caching import Cache
 import plotly.graph_objs as go
 from plotly.subplots import make_subplots
 from datetime import datetime, timedelta
@@ -14,44 +16,144 @@ from config import Config
 from data_fetcher import LiveDataFetcher
 from trading_engine import TradingEngine
 from portfolio import Portfolio
-import threading
-import time
+import os
+import math
+import atexit
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from apscheduler.schedulers.background import BackgroundScheduler
 
 # Initialize components
 data_fetcher = LiveDataFetcher()
 trading_engine = TradingEngine()
 portfolio = Portfolio(initial_balance=Config.WALLET_SIZE)
 
-# Global variable for trade suggestions (updated by background thread)
-cached_suggestions = []
-suggestions_lock = threading.Lock()
-last_suggestions_update = None
+# Suggestion fields sent to the browser for the trade suggestion cards
+SUGGESTION_FIELDS = (
+    'symbol', 'signal', 'current_price', 'price_change_24h', 'trend', 'confidence',
+    'score', 'risk_reward_ratio', 'suggested_investment', 'stop_loss', 'take_profit'
+)
 
-def update_suggestions_background():
-    """Background thread to update trade suggestions"""
-    global cached_suggestions, last_suggestions_update
-    while True:
-        try:
-            print("🔄 Updating trade suggestions in background...")
+# Trade suggestions published by the background job as one
+# (card dicts tuple, updated at) pair; readers take the reference without locking
+suggestions_snapshot = ((), None)
+
+def _refresh_suggestions():
+    """Scheduled job to update trade suggestions"""
+    global suggestions_snapshot
+    try:
+        print("🔄 Updating trade suggestions in background...")
+        snapshot_key = _snapshot_key()
+        if snapshot_key is None:
+            # No prices to key on: run uncached rather than pin an empty result for 5 min
             suggestions = trading_engine.get_trade_suggestions(num_suggestions=5, use_cache=False)
-            with suggestions_lock:
-                cached_suggestions = suggestions
-                last_suggestions_update = datetime.now()
-            print(f"✅ Updated {len(suggestions)} suggestions")
-        except Exception as e:
-            print(f"⚠️ Error updating suggestions: {e}")
-        time.sleep(120)  # Update every 2 minutes
+        else:
+            suggestions = _compute_suggestions(snapshot_key, 5)
+        # Card fields only, copied out of the engine's results; the dicts are
+        # shared with every reader and never changed after publishing
+        published = tuple(
+            {field: suggestion.get(field) for field in SUGGESTION_FIELDS}
+            for suggestion in suggestions
+        )
+        # Single rebind, so readers never see a half-updated pair
+        suggestions_snapshot = (published, datetime.now())
+        print(f"✅ Updated {len(suggestions)} suggestions")
+    except Exception as e:
+        print(f"⚠️ Error updating suggestions: {e}")
 
-# Start background thread
-suggestions_thread = threading.Thread(target=update_suggestions_background, daemon=True)
-suggestions_thread.start()
 
 # Initialize Dash app with Bootstrap theme
 app = dash.Dash(__name__, external_stylesheets=[dbc.themes.CYBORG])
 app.title = "CryptoAI Trading Assistant"
 
-# Color scheme - Professional Trading Platform Theme
-COLORS = {
+# Shared fetch cache so every open tab and tick within the TTL reuses one fetch
+# (use 'RedisCache' when running several server workers)
+cache = Cache(app.server, config={'CACHE_TYPE': 'SimpleCache'})
+
+
+@cache.memoize(timeout=60)
+def _cached_overview():
+    return data_fetcher.get_market_overview()
+
+
+@cache.memoize(timeout=60)
+def _cached_gainers(limit):
+    return data_fetcher.get_top_gainers(limit=limit)
+
+
+@cache.memoize(timeout=60)
+def _cached_trending(limit):
+    return data_fetcher.get_trending_coins(limit=limit)
+
+
+@cache.memoize(timeout=60)
+def _cached_sentiment():
+    return trading_engine.get_market_sentiment()
+
+
+@cache.memoize(timeout=30)
+def _cached_live_prices(coin_ids):
+    # coin_ids is a sorted tuple so the same set of coins shares one entry;
+    # get_live_prices fetches them all in a single batched request
+    return data_fetcher.get_live_prices(list(coin_ids))
+
+
+@cache.memoize(timeout=5)
+def _cached_trade_quote(coin_id):
+    # Short TTL: rapid repeat clicks reuse the quote, trades stay near-live
+    return data_fetcher.get_live_prices([coin_id])
+
+
+# Width of the log-spaced price buckets in the suggestions snapshot key (2%)
+_SNAPSHOT_BUCKET = math.log1p(0.02)
+
+
+def _snapshot_key():
+    """
+    Coarse hash of the analyzed coins' prices
+    
+    Returns:
+        Hex key that only changes once a price moves into another 2% bucket,
+        or None when no prices could be fetched
+    """
+    # Same coin list as get_trade_suggestions, so its own price fetch hits the fetcher cache
+    prices = trading_engine.data_fetcher.get_live_prices(Config.FAST_ANALYSIS_CRYPTOS)
+    snapshot = sorted(
+        (coin_id, math.floor(math.log(price) / _SNAPSHOT_BUCKET))
+        for coin_id, data in prices.items()
+        if (price := data.get('price') or 0) > 0
+    )
+    if not snapshot:
+        return None
+    return hashlib.blake2b(repr(snapshot).encode(), digest_size=16).hexdigest()
+
+
+# response_filter=bool: an empty run (e.g. failed analysis) is not cached
+@cache.memoize(timeout=300, response_filter=bool)
+def _compute_suggestions(snapshot_key, num_suggestions):
+    # Unchanged market snapshot -> skip the technical analysis run; the TTL spans
+    # a couple of 120s refresh cycles so a quiet market is analyzed at most every 5 min
+    return trading_engine.get_trade_suggestions(num_suggestions=num_suggestions, use_cache=False)
+
+
+# Runs the per-tick data fetches concurrently instead of one after another
+_pool = ThreadPoolExecutor(max_workers=8)
+
+# Refresh every 2 minutes, starting now; a slow run is never stacked or replayed
+scheduler = BackgroundScheduler(daemon=True)
+scheduler.add_job(_refresh_suggestions, 'interval', seconds=120, next_run_time=datetime.now(),
+                  max_instances=1, coalesce=True)
+atexit.register(lambda: _pool.shutdown(wait=False))
+
+
+def _start_scheduler():
+    """Start the suggestions job in the process that serves requests"""
+    scheduler.start()
+    atexit.register(lambda: scheduler.shutdown(wait=False))
+
+# Color scheme - Professional Trading Platform Theme (read-only)
+COLORS = MappingProxyType({
     'background': '#0a0e27',
     'card_bg': '#141b2d',
     'card_border': '#1e293b',
@@ -65,11 +167,73 @@ COLORS = {
     'grid_color': '#334155',
     'buy_green': '#10b981',
     'sell_red': '#ef4444'
+})
+
+# Coin selector options, built once instead of on every layout request
+_COIN_OPTIONS = [{'label': coin.title(), 'value': coin} for coin in dict.fromkeys(Config.TOP_CRYPTOS)]
+
+# Bootstrap colour for each technical signal badge
+SIGNAL_COLOR = MappingProxyType({
+    'strong_buy': 'success',
+    'buy': 'info',
+    'neutral': 'secondary',
+    'sell': 'warning',
+    'strong_sell': 'danger'
+})
+
+# Gainers/trending tables refresh on every Nth interval tick (every 5 minutes)
+MARKET_TABLE_REFRESH_TICKS = 5
+
+# Coin analysis columns, rendered as one Markdown block each instead of P/Strong trees
+_PRICE_INFO_TEMPLATE = (
+    "**Current Price:** ${current_price:,.6f}  \n"
+    "**24h High:** ${high_24h:,.6f}  \n"
+    "**24h Low:** ${low_24h:,.6f}  \n"
+    "**24h Change:** {price_change_percentage_24h:+.2f}%"
+)
+_MARKET_STATS_TEMPLATE = (
+    "**Market Cap:** ${market_cap:,.0f}  \n"
+    "**Rank:** #{market_cap_rank}  \n"
+    "**7d Change:** {price_change_percentage_7d:+.2f}%  \n"
+    "**30d Change:** {price_change_percentage_30d:+.2f}%"
+)
+_TECHNICAL_TEMPLATE = (
+    "**Signal:** {signal}  \n"
+    "**Trend:** {trend}  \n"
+    "**Confidence:** {confidence:.1f}%"
+)
+
+
+class _Defaulted(dict):
+    """Template values that fall back to 0 for missing keys"""
+    def __missing__(self, key):
+        return 0
+
+
+# Shared DataTable styling, built once for every table
+_TABLE_STYLE_CELL = {
+    'backgroundColor': COLORS['card_bg'],
+    'color': COLORS['text'],
+    'border': '1px solid #2d3748',
+    'textAlign': 'left',
+    'padding': '10px'
+}
+_TABLE_STYLE_HEADER = {
+    'backgroundColor': '#1a202c',
+    'fontWeight': 'bold',
+    'border': '1px solid #2d3748'
 }
 
+# Portfolio tables are built once in the layout; callbacks only send rows
+POSITION_COLUMNS = ('Symbol', 'Quantity', 'Avg Price', 'Current Price', 'Value', 'P/L', 'P/L %')
+HISTORY_COLUMNS = ('Type', 'Symbol', 'Quantity', 'Price', 'Amount', 'Time')
+GAINERS_COLUMNS = ('Symbol', 'Name', 'Price', '24h Change')
+TRENDING_COLUMNS = ('Symbol', 'Name', 'Market Cap Rank')
+
 # App Layout
 app.layout = dbc.Container([
     dcc.Interval(id='interval-component', interval=60*1000, n_intervals=0),  # Update every 60 seconds (reduced load)
+    dcc.Store(id='app-state'),  # Raw portfolio/sentiment/market numbers, rendered client-side
     
     # Header with Live Ticker
     dbc.Row([
@@ -142,7 +306,10 @@ app.layout = dbc.Container([
                         dbc.CardBody([
                             dbc.Button("🔄 Refresh Suggestions", id="refresh-suggestions-btn", 
                                      color="primary", className="mb-3"),
-                            html.Div(id="loading-suggestions", className="mb-3"),
+                            dcc.Interval(id="refresh-suggestions-cooldown", interval=1000, disabled=True),
+                            dcc.Store(id="suggestions-data"),
+                            dcc.Interval(id="suggestions-clock", interval=30*1000),  # Client-side "N minutes ago" refresh
+                            html.Div(id="last-updated-label"),
                             html.Div(id="trade-suggestions-content")
                         ])
                     ], className="mb-4", style={'backgroundColor': COLORS['card_bg']})
@@ -157,7 +324,23 @@ app.layout = dbc.Container([
                     dbc.Card([
                         dbc.CardHeader(html.H5("💼 Current Positions", className="mb-0")),
                         dbc.CardBody([
-                            html.Div(id="positions-table")
+                            dcc.Store(id="positions-hash"),
+                            html.Div(id="positions-empty"),
+                            html.Div([
+                                dash_table.DataTable(
+                                    id="positions-datatable",
+                                    data=[],
+                                    columns=[{"name": i, "id": i} for i in POSITION_COLUMNS],
+                                    style_cell=_TABLE_STYLE_CELL,
+                                    style_header=_TABLE_STYLE_HEADER,
+                                    style_data_conditional=[
+                                        {
+                                            'if': {'column_id': 'P/L'},
+                                            'color': COLORS['success']
+                                        }
+                                    ]
+                                )
+                            ], id="positions-table", hidden=True)
                         ])
                     ], className="mb-4", style={'backgroundColor': COLORS['card_bg']})
                 ], width=8),
@@ -182,7 +365,16 @@ app.layout = dbc.Container([
                     dbc.Card([
                         dbc.CardHeader(html.H5("📜 Trade History", className="mb-0")),
                         dbc.CardBody([
-                            html.Div(id="trade-history-table")
+                            html.Div(id="trade-history-empty"),
+                            html.Div([
+                                dash_table.DataTable(
+                                    id="trade-history-datatable",
+                                    data=[],
+                                    columns=[{"name": i, "id": i} for i in HISTORY_COLUMNS],
+                                    style_cell=_TABLE_STYLE_CELL,
+                                    style_header=_TABLE_STYLE_HEADER
+                                )
+                            ], id="trade-history-table", hidden=True)
                         ])
                     ], style={'backgroundColor': COLORS['card_bg']})
                 ], width=12)
@@ -205,7 +397,16 @@ app.layout = dbc.Container([
                     dbc.Card([
                         dbc.CardHeader(html.H5("🚀 Top Gainers (24h)", className="mb-0")),
                         dbc.CardBody([
-                            html.Div(id="top-gainers-table")
+                            html.Div(id="top-gainers-empty"),
+                            html.Div([
+                                dash_table.DataTable(
+                                    id="top-gainers-datatable",
+                                    data=[],
+                                    columns=[{"name": i, "id": i} for i in GAINERS_COLUMNS],
+                                    style_cell=_TABLE_STYLE_CELL,
+                                    style_header=_TABLE_STYLE_HEADER
+                                )
+                            ], id="top-gainers-table", hidden=True)
                         ])
                     ], className="mb-4", style={'backgroundColor': COLORS['card_bg']})
                 ], width=6)
@@ -216,7 +417,16 @@ app.layout = dbc.Container([
                     dbc.Card([
                         dbc.CardHeader(html.H5("🔥 Trending Coins", className="mb-0")),
                         dbc.CardBody([
-                            html.Div(id="trending-coins-table")
+                            html.Div(id="trending-coins-empty"),
+                            html.Div([
+                                dash_table.DataTable(
+                                    id="trending-coins-datatable",
+                                    data=[],
+                                    columns=[{"name": i, "id": i} for i in TRENDING_COLUMNS],
+                                    style_cell=_TABLE_STYLE_CELL,
+                                    style_header=_TABLE_STYLE_HEADER
+                                )
+                            ], id="trending-coins-table", hidden=True)
                         ])
                     ], style={'backgroundColor': COLORS['card_bg']})
                 ], width=12)
@@ -235,8 +445,7 @@ app.layout = dbc.Container([
                                     dbc.Label("Select Coin"),
                                     dcc.Dropdown(
                                         id='coin-selector',
-                                        options=[{'label': coin.title(), 'value': coin} 
-                                                for coin in Config.TOP_CRYPTOS],
+                                        options=_COIN_OPTIONS,
                                         value='bitcoin',
                                         className="mb-3"
                                     )
@@ -244,6 +453,7 @@ app.layout = dbc.Container([
                                 dbc.Col([
                                     dbc.Button("Analyze", id="analyze-coin-btn", 
                                              color="primary", className="mt-4"),
+                                    dcc.Interval(id="analyze-coin-cooldown", interval=1000, disabled=True),
                                 ], width=6)
                             ]),
                             html.Hr(),
@@ -269,210 +479,234 @@ app.layout = dbc.Container([
 
 # Callbacks
 @app.callback(
-    [Output("portfolio-value", "children"),
-     Output("portfolio-change", "children"),
-     Output("cash-balance", "children"),
-     Output("positions-count", "children"),
-     Output("total-return", "children"),
-     Output("return-percent", "children")],
-    [Input("interval-component", "n_intervals")]
+    [Output("app-state", "data"),
+     Output("positions-datatable", "data"),
+     Output("positions-empty", "children"),
+     Output("positions-table", "hidden"),
+     Output("positions-hash", "data"),
+     Output("trade-history-datatable", "data"),
+     Output("trade-history-empty", "children"),
+     Output("trade-history-table", "hidden")],
+    [Input("interval-component", "n_intervals"),
+     Input("trade-result", "children")],
+    [State("positions-hash", "data")]
 )
-def update_portfolio_stats(n):
-    """Update portfolio statistics"""
+def update_dashboard(n, trade_result, served_hash):
+    """
+    Refresh every interval-driven output in one callback (one HTTP round trip)
+    
+    Also re-runs once execute_trade has written its result, so cash, positions
+    and history reflect the new trade straight away.
+    """
+    state = _collect_app_state(n)
+    return (state,) + _positions_outputs(served_hash) + _history_outputs()
+
+
+def _collect_app_state(n):
+    """
+    Collect portfolio, sentiment and market data for the app-state store
+    
+    The fetches run in parallel on _pool. Formatting of the cards happens in
+    assets/clientside.js, so only raw values (and pre-formatted table rows)
+    are sent.
+    """
+    state = {'portfolio': None, 'sentiment': None, 'market': None}
+    
+    futures = {
+        'sentiment': _pool.submit(_cached_sentiment),
+        'market': _pool.submit(_cached_overview)
+    }
+    if portfolio.positions:
+        coin_ids = tuple(sorted(set(portfolio.positions)))
+        futures['prices'] = _pool.submit(_cached_live_prices, coin_ids)
+    
+    # Gainers/trending render on page load, then only every few ticks
+    refresh_tables = not n or n % MARKET_TABLE_REFRESH_TICKS == 0
+    if refresh_tables:
+        futures['gainers'] = _pool.submit(_cached_gainers, 10)
+        futures['trending'] = _pool.submit(_cached_trending, 10)
+    
     try:
         # Update prices
-        if portfolio.positions:
-            coin_ids = list(portfolio.positions.keys())
-            live_prices = data_fetcher.get_live_prices(coin_ids)
+        if 'prices' in futures:
+            live_prices = futures['prices'].result()
             if live_prices:
                 portfolio.update_prices(live_prices)
         
-        performance = portfolio.get_portfolio_performance()
-        
-        portfolio_value = f"${performance['current_value']:,.2f}"
-        portfolio_change = f"Initial: ${performance['initial_balance']:,.2f}"
-        cash_balance = f"${performance['cash_balance']:,.2f}"
-        positions_count = f"{performance['num_positions']} positions"
-        total_return = f"${performance['total_return']:,.2f}"
-        return_percent = f"{performance['return_percent']:+.2f}%"
-        
-        return portfolio_value, portfolio_change, cash_balance, positions_count, total_return, return_percent
+        state['portfolio'] = portfolio.get_portfolio_performance()
     except Exception as e:
         print(f"Error updating portfolio stats: {e}")
-        return "$0.00", "...", "$0.00", "0 positions", "$0.00", "+0.00%"
+    
+    try:
+        sentiment_data = futures['sentiment'].result()
+        if sentiment_data and 'sentiment' in sentiment_data:
+            state['sentiment'] = {
+                'sentiment': sentiment_data['sentiment'],
+                'market_cap_change_24h': sentiment_data.get('market_cap_change_24h', 0)
+            }
+        else:
+            state['sentiment'] = {'sentiment': 'Neutral', 'market_cap_change_24h': None}
+    except Exception as e:
+        print(f"Error updating market sentiment: {e}")
+    
+    try:
+        state['market'] = futures['market'].result() or None
+    except Exception as e:
+        print(f"Error loading market overview: {e}")
+    
+    if refresh_tables:
+        try:
+            state['gainers'] = {'rows': _gainers_rows(futures['gainers'].result())}
+        except Exception as e:
+            print(f"Error loading top gainers: {e}")
+            state['gainers'] = {'error': True}
+        
+        try:
+            state['trending'] = {'rows': _trending_rows(futures['trending'].result())}
+        except Exception as e:
+            print(f"Error loading trending coins: {e}")
+            state['trending'] = {'error': True}
+    
+    return state
 
 
-@app.callback(
+def _gainers_rows(gainers):
+    """Format top gainers as DataTable rows"""
+    if not gainers:
+        return []
+    
+    df = pd.DataFrame(gainers)
+    return pd.DataFrame({
+        'Symbol': df['symbol'].fillna('?').str.upper(),
+        'Name': df['name'].fillna('Unknown'),
+        'Price': df['price'].fillna(0).map('${:,.6f}'.format),
+        '24h Change': df['change_24h'].fillna(0).map('{:+.2f}%'.format)
+    }).to_dict('records')
+
+
+def _trending_rows(trending):
+    """Format trending coins as DataTable rows"""
+    if not trending:
+        return []
+    
+    df = pd.DataFrame(trending)
+    return pd.DataFrame({
+        'Symbol': df['symbol'].fillna('?').str.upper(),
+        'Name': df['name'].fillna('Unknown'),
+        'Market Cap Rank': '#' + df['market_cap_rank'].astype(str)
+    }).to_dict('records')
+
+
+app.clientside_callback(
+    ClientsideFunction(namespace='ui', function_name='render_portfolio'),
+    [Output("portfolio-value", "children"),
+     Output("portfolio-change", "children"),
+     Output("cash-balance", "children"),
+     Output("positions-count", "children"),
+     Output("total-return", "children"),
+     Output("return-percent", "children")],
+    [Input("app-state", "data")]
+)
+
+app.clientside_callback(
+    ClientsideFunction(namespace='ui', function_name='render_sentiment'),
     [Output("market-sentiment", "children"),
      Output("market-cap-change", "children")],
-    [Input("interval-component", "n_intervals")]
+    [Input("app-state", "data")]
+)
+
+app.clientside_callback(
+    ClientsideFunction(namespace='ui', function_name='render_market'),
+    Output("market-overview-content", "children"),
+    [Input("app-state", "data")]
+)
+
+app.clientside_callback(
+    ClientsideFunction(namespace='ui', function_name='render_gainers'),
+    [Output("top-gainers-datatable", "data"),
+     Output("top-gainers-empty", "children"),
+     Output("top-gainers-table", "hidden")],
+    [Input("app-state", "data")]
+)
+
+app.clientside_callback(
+    ClientsideFunction(namespace='ui', function_name='render_trending'),
+    [Output("trending-coins-datatable", "data"),
+     Output("trending-coins-empty", "children"),
+     Output("trending-coins-table", "hidden")],
+    [Input("app-state", "data")]
 )
-def update_market_sentiment(n):
-    """Update market sentiment"""
-    try:
-        sentiment_data = trading_engine.get_market_sentiment()
-        if sentiment_data and 'sentiment' in sentiment_data:
-            sentiment = sentiment_data['sentiment']
-            market_cap_change = f"24h: {sentiment_data.get('market_cap_change_24h', 0):+.2f}%"
-            return sentiment, market_cap_change
-        return "Neutral", "0.00%"
-    except Exception as e:
-        print(f"Error updating market sentiment: {e}")
-        return "Loading...", "..."
 
 
 @app.callback(
-    [Output("trade-suggestions-content", "children"),
-     Output("loading-suggestions", "children")],
+    Output("suggestions-data", "data"),
     [Input("refresh-suggestions-btn", "n_clicks")]
 )
 def update_trade_suggestions(n_clicks):
-    """Display cached trade suggestions (no heavy processing)"""
-    global cached_suggestions, last_suggestions_update
-    
+    """Publish cached trade suggestions for client-side rendering (no heavy processing)"""
     # Show initial message on page load
     if not n_clicks:
-        return [dbc.Alert("Click 'Refresh Suggestions' to see the latest trade ideas.", color="info")], ""
+        return {'status': 'idle'}
     
     try:
-        # Get suggestions from cache
-        with suggestions_lock:
-            suggestions = cached_suggestions.copy()
-            last_update = last_suggestions_update
-        
-        if not suggestions:
-            return [dbc.Alert("Analyzing market... Please wait a moment and try again.", color="warning")], ""
-        
-        cards = []
-        for i, suggestion in enumerate(suggestions, 1):
-            signal_color = {
-                'strong_buy': 'success',
-                'buy': 'info',
-                'neutral': 'secondary',
-                'sell': 'warning',
-                'strong_sell': 'danger'
-            }.get(suggestion.get('signal', 'neutral'), 'secondary')
-            
-            card = dbc.Card([
-                dbc.CardHeader([
-                    html.H5([
-                        f"#{i} {suggestion.get('symbol', '?').upper()} ",
-                        dbc.Badge(suggestion.get('signal', 'NEUTRAL').upper(), color=signal_color, className="ms-2")
-                    ], className="mb-0")
-                ]),
-                dbc.CardBody([
-                    dbc.Row([
-                        dbc.Col([
-                            html.P([
-                                html.Strong("Current Price: "),
-                                f"${suggestion.get('current_price', 0):,.6f}"
-                            ], className="mb-1"),
-                            html.P([
-                                html.Strong("24h Change: "),
-                                html.Span(f"{suggestion.get('price_change_24h', 0):+.2f}%",
-                                        className="text-success" if suggestion.get('price_change_24h', 0) > 0 else "text-danger")
-                            ], className="mb-1"),
-                            html.P([
-                                html.Strong("Trend: "),
-                                suggestion.get('trend', 'neutral').replace('_', ' ').title()
-                            ], className="mb-1"),
-                        ], width=4),
-                        
-                        dbc.Col([
-                            html.P([
-                                html.Strong("Confidence: "),
-                                f"{suggestion.get('confidence', 0):.1f}%"
-                            ], className="mb-1"),
-                            html.P([
-                                html.Strong("Score: "),
-                                f"{suggestion.get('score', 0):.1f}/100"
-                            ], className="mb-1"),
-                            html.P([
-                                html.Strong("Risk/Reward: "),
-                                f"{suggestion.get('risk_reward_ratio', 0):.2f}"
-                            ], className="mb-1"),
-                        ], width=4),
-                        
-                        dbc.Col([
-                            html.P([
-                                html.Strong("Suggested Investment: "),
-                                html.Span(f"${suggestion.get('suggested_investment', 0):,.2f}", 
-                                        className="text-warning")
-                            ], className="mb-1"),
-                            html.P([
-                                html.Strong("Stop Loss: "),
-                                f"${suggestion.get('stop_loss', 0):,.6f}"
-                            ], className="mb-1"),
-                            html.P([
-                                html.Strong("Take Profit: "),
-                                f"${suggestion.get('take_profit', 0):,.6f}"
-                            ], className="mb-1"),
-                        ], width=4),
-                    ])
-                ])
-            ], className="mb-3", style={'backgroundColor': COLORS['card_bg']})
-            
-            cards.append(card)
-        
-        # Add timestamp
-        if last_update:
-            time_ago = (datetime.now() - last_update).seconds // 60
-            cards.insert(0, dbc.Alert(f"Last updated: {time_ago} minute(s) ago", color="info", className="mb-3"))
-        
-        return cards, ""
+        # Get suggestions from the published snapshot (no lock)
+        suggestions, last_update = suggestions_snapshot
+        
+        return {
+            'status': 'ready',
+            # Already cut down to the card fields (indicators etc. stay server-side)
+            'suggestions': list(suggestions),
+            # Timezone-aware so the browser can work out the age itself
+            'updated': last_update.astimezone().isoformat(timespec='seconds') if last_update else None
+        }
     
     except Exception as e:
         print(f"Error displaying suggestions: {e}")
-        return [dbc.Alert(f"Error: {str(e)}", color="danger")], ""
+        return {'status': 'error', 'message': str(e)}
 
 
-@app.callback(
-    Output("positions-table", "children"),
-    [Input("interval-component", "n_intervals"),
-     Input("execute-trade-btn", "n_clicks")]
+app.clientside_callback(
+    ClientsideFunction(namespace='ui', function_name='render_suggestions'),
+    Output("trade-suggestions-content", "children"),
+    [Input("suggestions-data", "data")]
+)
+
+app.clientside_callback(
+    ClientsideFunction(namespace='ui', function_name='render_last_updated'),
+    Output("last-updated-label", "children"),
+    [Input("suggestions-clock", "n_intervals"),
+     Input("suggestions-data", "data")]
 )
-def update_positions_table(n_intervals, n_clicks):
-    """Display current positions"""
+
+
+def _positions_outputs(served_hash):
+    """Positions table rows, empty-state alert, hidden flag and positions hash"""
+    # Skip the update when this tab already shows the same positions
+    positions_hash = hash(tuple(
+        (coin_id, pos['quantity'], pos['avg_price'], pos['current_price'])
+        for coin_id, pos in sorted(portfolio.positions.items())
+    ))
+    if positions_hash == served_hash:
+        return no_update, no_update, no_update, no_update
+    
     positions = portfolio.get_positions_summary()
     
     if not positions:
-        return dbc.Alert("No active positions. Execute a trade to get started!", color="info")
+        return [], dbc.Alert("No active positions. Execute a trade to get started!", color="info"), True, positions_hash
     
-    # Create table data
-    table_data = []
-    for pos in positions:
-        table_data.append({
-            'Symbol': pos['symbol'],
-            'Quantity': f"{pos['quantity']:.8f}",
-            'Avg Price': f"${pos['avg_price']:,.6f}",
-            'Current Price': f"${pos['current_price']:,.6f}",
-            'Value': f"${pos['current_value']:,.2f}",
-            'P/L': f"${pos['profit_loss']:,.2f}",
-            'P/L %': f"{pos['profit_loss_percent']:+.2f}%"
-        })
+    # Format whole columns at once
+    df = pd.DataFrame(positions)
+    table = pd.DataFrame({
+        'Symbol': df['symbol'],
+        'Quantity': df['quantity'].map('{:.8f}'.format),
+        'Avg Price': df['avg_price'].map('${:,.6f}'.format),
+        'Current Price': df['current_price'].map('${:,.6f}'.format),
+        'Value': df['current_value'].map('${:,.2f}'.format),
+        'P/L': df['profit_loss'].map('${:,.2f}'.format),
+        'P/L %': df['profit_loss_percent'].map('{:+.2f}%'.format)
+    })
     
-    return dash_table.DataTable(
-        data=table_data,
-        columns=[{"name": i, "id": i} for i in table_data[0].keys()],
-        style_cell={
-            'backgroundColor': COLORS['card_bg'],
-            'color': COLORS['text'],
-            'border': '1px solid #2d3748',
-            'textAlign': 'left',
-            'padding': '10px'
-        },
-        style_header={
-            'backgroundColor': '#1a202c',
-            'fontWeight': 'bold',
-            'border': '1px solid #2d3748'
-        },
-        style_data_conditional=[
-            {
-                'if': {'column_id': 'P/L'},
-                'color': COLORS['success']
-            }
-        ]
-    )
+    return table.to_dict('records'), None, False, positions_hash
 
 
 @app.callback(
@@ -484,7 +718,8 @@ def update_positions_table(n_intervals, n_clicks):
 def execute_trade(n_clicks, coin_id, amount):
     """Execute a simulated trade"""
     if not n_clicks:
-        return ""
+        # Leave trade-result untouched so update_dashboard isn't re-triggered on load
+        raise PreventUpdate
     
     if not coin_id or not amount:
         return dbc.Alert("Please enter both coin ID and amount!", color="warning", dismissable=True)
@@ -496,7 +731,7 @@ def execute_trade(n_clicks, coin_id, amount):
             return dbc.Alert("Insufficient funds!", color="danger", dismissable=True)
         
         # Get current price
-        live_prices = data_fetcher.get_live_prices([coin_id])
+        live_prices = _cached_trade_quote(coin_id)
         
         if coin_id not in live_prices:
             return dbc.Alert("Invalid coin ID! Use lowercase names like 'bitcoin'", color="danger", dismissable=True)
@@ -522,161 +757,39 @@ def execute_trade(n_clicks, coin_id, amount):
         return dbc.Alert(f"Error: {str(e)}", color="danger", dismissable=True)
 
 
-@app.callback(
-    Output("trade-history-table", "children"),
-    [Input("interval-component", "n_intervals"),
-     Input("execute-trade-btn", "n_clicks")]
-)
-def update_trade_history(n_intervals, n_clicks):
-    """Display trade history"""
+def _history_outputs():
+    """Trade history table rows, empty-state alert and hidden flag"""
     history = portfolio.get_trade_history(limit=10)
     
     if not history:
-        return dbc.Alert("No trade history yet.", color="info")
+        return [], dbc.Alert("No trade history yet.", color="info"), True
     
-    table_data = []
-    for trade in history:
-        table_data.append({
-            'Type': trade['type'],
-            'Symbol': trade['symbol'],
-            'Quantity': f"{trade['quantity']:.8f}",
-            'Price': f"${trade['price']:,.6f}",
-            'Amount': f"${trade.get('cost', trade.get('proceeds', 0)):,.2f}",
-            'Time': trade['timestamp'][:19]
-        })
+    df = pd.DataFrame(history)
+    # Buys record 'cost', sells record 'proceeds'
+    amount = df.get('cost', pd.Series(index=df.index, dtype=float))
+    amount = amount.fillna(df.get('proceeds', 0)).fillna(0)
+    table = pd.DataFrame({
+        'Type': df['type'],
+        'Symbol': df['symbol'],
+        'Quantity': df['quantity'].map('{:.8f}'.format),
+        'Price': df['price'].map('${:,.6f}'.format),
+        'Amount': amount.map('${:,.2f}'.format),
+        'Time': df['timestamp'].str[:19]
+    })
     
-    return dash_table.DataTable(
-        data=table_data,
-        columns=[{"name": i, "id": i} for i in table_data[0].keys()],
-        style_cell={
-            'backgroundColor': COLORS['card_bg'],
-            'color': COLORS['text'],
-            'border': '1px solid #2d3748',
-            'textAlign': 'left',
-            'padding': '10px'
-        },
-        style_header={
-            'backgroundColor': '#1a202c',
-            'fontWeight': 'bold',
-            'border': '1px solid #2d3748'
-        }
-    )
-
-
-@app.callback(
-    Output("market-overview-content", "children"),
-    [Input("interval-component", "n_intervals")]
-)
-def update_market_overview(n):
-    """Display market overview"""
-    try:
-        overview = data_fetcher.get_market_overview()
-        
-        if not overview:
-            return dbc.Alert("Market data temporarily unavailable", color="info")
-        
-        stats = [
-            html.P([html.Strong("Total Market Cap: "), f"${overview.get('total_market_cap_usd', 0):,.0f}"]),
-            html.P([html.Strong("24h Volume: "), f"${overview.get('total_volume_24h_usd', 0):,.0f}"]),
-            html.P([html.Strong("BTC Dominance: "), f"{overview.get('btc_dominance', 0):.2f}%"]),
-            html.P([html.Strong("ETH Dominance: "), f"{overview.get('eth_dominance', 0):.2f}%"]),
-            html.P([html.Strong("Active Cryptocurrencies: "), f"{overview.get('active_cryptocurrencies', 0):,}"]),
-            html.P([html.Strong("Markets: "), f"{overview.get('markets', 0):,}"]),
-        ]
-        
-        return stats
-    except Exception as e:
-        print(f"Error loading market overview: {e}")
-        return dbc.Alert("Market data temporarily unavailable", color="warning")
-
-
-@app.callback(
-    Output("top-gainers-table", "children"),
-    [Input("interval-component", "n_intervals")]
-)
-def update_top_gainers(n):
-    """Display top gainers"""
-    try:
-        gainers = data_fetcher.get_top_gainers(limit=10)
-        
-        if not gainers:
-            return dbc.Alert("No gainers data available", color="info")
-        
-        table_data = []
-        for coin in gainers:
-            table_data.append({
-                'Symbol': coin.get('symbol', '?').upper(),
-                'Name': coin.get('name', 'Unknown'),
-                'Price': f"${coin.get('price', 0):,.6f}",
-                '24h Change': f"{coin.get('change_24h', 0):+.2f}%"
-            })
-        
-        if not table_data:
-            return dbc.Alert("No gainers data available", color="info")
-        
-        return dash_table.DataTable(
-            data=table_data,
-            columns=[{"name": i, "id": i} for i in table_data[0].keys()],
-            style_cell={
-                'backgroundColor': COLORS['card_bg'],
-                'color': COLORS['text'],
-                'border': '1px solid #2d3748',
-                'textAlign': 'left',
-                'padding': '10px'
-            },
-            style_header={
-                'backgroundColor': '#1a202c',
-                'fontWeight': 'bold',
-                'border': '1px solid #2d3748'
-            }
-        )
-    except Exception as e:
-        print(f"Error loading top gainers: {e}")
-        return dbc.Alert("Data temporarily unavailable", color="warning")
+    return table.to_dict('records'), None, False
 
 
-@app.callback(
-    Output("trending-coins-table", "children"),
-    [Input("interval-component", "n_intervals")]
-)
-def update_trending_coins(n):
-    """Display trending coins"""
-    try:
-        trending = data_fetcher.get_trending_coins(limit=10)
-        
-        if not trending:
-            return dbc.Alert("No trending data available", color="info")
-        
-        table_data = []
-        for coin in trending:
-            table_data.append({
-                'Symbol': coin.get('symbol', '?').upper(),
-                'Name': coin.get('name', 'Unknown'),
-                'Market Cap Rank': f"#{coin.get('market_cap_rank', 'N/A')}"
-            })
-        
-        if not table_data:
-            return dbc.Alert("No trending data available", color="info")
-        
-        return dash_table.DataTable(
-            data=table_data,
-            columns=[{"name": i, "id": i} for i in table_data[0].keys()],
-            style_cell={
-                'backgroundColor': COLORS['card_bg'],
-                'color': COLORS['text'],
-                'border': '1px solid #2d3748',
-                'textAlign': 'left',
-                'padding': '10px'
-            },
-            style_header={
-                'backgroundColor': '#1a202c',
-                'fontWeight': 'bold',
-                'border': '1px solid #2d3748'
-            }
-        )
-    except Exception as e:
-        print(f"Error loading trending coins: {e}")
-        return dbc.Alert("Data temporarily unavailable", color="warning")
+# Disable each button for 1s after a click so repeated clicks can't pile up server callbacks
+for _button_id, _cooldown_id in (("refresh-suggestions-btn", "refresh-suggestions-cooldown"),
+                                 ("analyze-coin-btn", "analyze-coin-cooldown")):
+    app.clientside_callback(
+        ClientsideFunction(namespace='ui', function_name='debounce_button'),
+        [Output(_button_id, "disabled"),
+         Output(_cooldown_id, "disabled")],
+        [Input(_button_id, "n_clicks"),
+         Input(_cooldown_id, "n_intervals")]
+    )
 
 
 @app.callback(
@@ -698,13 +811,8 @@ def analyze_specific_coin(n_clicks, coin_id):
         coin_info = analysis['coin_info']
         tech_analysis = analysis['technical_analysis']
         
-        signal_color = {
-            'strong_buy': 'success',
-            'buy': 'info',
-            'neutral': 'secondary',
-            'sell': 'warning',
-            'strong_sell': 'danger'
-        }.get(tech_analysis['overall_signal'], 'secondary')
+        signal_color = SIGNAL_COLOR.get(tech_analysis['overall_signal'], 'secondary')
+        info = _Defaulted(coin_info)
         
         content = [
             dbc.Row([
@@ -722,25 +830,21 @@ def analyze_specific_coin(n_clicks, coin_id):
             dbc.Row([
                 dbc.Col([
                     html.H6("Price Information"),
-                    html.P([html.Strong("Current Price: "), f"${coin_info['current_price']:,.6f}"]),
-                    html.P([html.Strong("24h High: "), f"${coin_info['high_24h']:,.6f}"]),
-                    html.P([html.Strong("24h Low: "), f"${coin_info['low_24h']:,.6f}"]),
-                    html.P([html.Strong("24h Change: "), f"{coin_info['price_change_percentage_24h']:+.2f}%"]),
+                    dcc.Markdown(_PRICE_INFO_TEMPLATE.format_map(info)),
                 ], width=4),
                 
                 dbc.Col([
                     html.H6("Market Stats"),
-                    html.P([html.Strong("Market Cap: "), f"${coin_info['market_cap']:,.0f}"]),
-                    html.P([html.Strong("Rank: "), f"#{coin_info['market_cap_rank']}"]),
-                    html.P([html.Strong("7d Change: "), f"{coin_info.get('price_change_percentage_7d', 0):+.2f}%"]),
-                    html.P([html.Strong("30d Change: "), f"{coin_info.get('price_change_percentage_30d', 0):+.2f}%"]),
+                    dcc.Markdown(_MARKET_STATS_TEMPLATE.format_map(info)),
                 ], width=4),
                 
                 dbc.Col([
                     html.H6("Technical Analysis"),
-                    html.P([html.Strong("Signal: "), tech_analysis['overall_signal'].upper()]),
-                    html.P([html.Strong("Trend: "), tech_analysis['price_trend'].replace('_', ' ').title()]),
-                    html.P([html.Strong("Confidence: "), f"{tech_analysis['confidence']:.1f}%"]),
+                    dcc.Markdown(_TECHNICAL_TEMPLATE.format_map({
+                        'signal': tech_analysis['overall_signal'].upper(),
+                        'trend': tech_analysis['price_trend'].replace('_', ' ').title(),
+                        'confidence': tech_analysis['confidence']
+                    })),
                 ], width=4),
             ])
         ]
@@ -755,4 +859,9 @@ if __name__ == '__main__':
     print("🚀 Starting CryptoAI Trading Assistant Dashboard...")
     print("📊 Opening browser at http://127.0.0.1:8050")
     print("⚠️  Press Ctrl+C to stop the server")
-    app.run(debug=True, host='127.0.0.1', port=8050)
+    debug = True
+    # In debug mode the reloader runs this file twice: a file watcher and the
+    # serving child (WERKZEUG_RUN_MAIN set). Only the child gets the scheduler.
+    if not debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        _start_scheduler()
+    app.run(debug=debug, host='127.0.0.1', port=8050)
@@ -3,13 +3,16 @@ Enhanced Web Dashboard UI for CryptoAI Trading Assistant
 Advanced features inspired by top trading platforms
 """
 import dash
-from dash import dcc, html, Input, Output, State, dash_table, ctx
+from dash import dcc, html, Input, Output, State, dash_table, ctx, no_update, ClientsideFunction, Patch
 import dash_bootstrap_components as dbc
+from flask_caching import Cache
 import plotly.graph_objs as go
 from plotly.subplots import make_subplots
 from datetime import datetime, timedelta
 import pandas as pd
 import numpy as np
+import atexit
+from concurrent.futures import ThreadPoolExecutor
 from config import Config
 from data_fetcher import LiveDataFetcher
 from trading_engine import TradingEngine
@@ -24,6 +27,47 @@ portfolio = Portfolio(initial_balance=Config.WALLET_SIZE)
 app = dash.Dash(__name__, external_stylesheets=[dbc.themes.CYBORG])
 app.title = "CryptoAI Trading Assistant Pro"
 
+# Shared fetch cache so callbacks firing in the same window reuse one fetch
+# (use 'RedisCache' when running several server workers)
+cache = Cache(app.server, config={'CACHE_TYPE': 'SimpleCache'})
+
+
+# Coins shown in the header ticker
+TICKER_COINS = ('bitcoin', 'ethereum', 'binancecoin')
+
+
+@cache.memoize(timeout=9)
+def _cached_live_prices(coin_ids):
+    # TTL spans a 5s fast tick, so each fetch also serves the next tick
+    return data_fetcher.get_live_prices(list(coin_ids))
+
+
+def get_live_prices_cached(coin_ids):
+    """
+    Live prices for coin_ids, sliced from one shared fetch
+    
+    Every caller asks for the same set (ticker coins + held coins + coin_ids),
+    so the ticker and portfolio callbacks hit the same cache entry.
+    """
+    union = tuple(sorted(set(TICKER_COINS).union(portfolio.positions, coin_ids)))
+    prices = _cached_live_prices(union)
+    return {coin_id: prices[coin_id] for coin_id in coin_ids if coin_id in prices}
+
+
+@cache.memoize(timeout=30)
+def get_market_overview_cached():
+    return data_fetcher.get_market_overview()
+
+
+@cache.memoize(timeout=30)
+def get_market_sentiment_cached():
+    return trading_engine.get_market_sentiment()
+
+
+# Runs the slow-tick price and sentiment fetches concurrently instead of one after another
+_pool = ThreadPoolExecutor(max_workers=4)
+atexit.register(lambda: _pool.shutdown(wait=False))
+
 # Professional Trading Platform Color Scheme
 COLORS = {
     'background': '#0a0e27',
@@ -42,11 +86,67 @@ COLORS = {
     'neutral': '#6366f1'
 }
 
+# Built once at import and shared by the trade and analysis dropdowns
+_COIN_OPTIONS = [{'label': coin.title(), 'value': coin} for coin in dict.fromkeys(Config.TOP_CRYPTOS)]
+
+# Shared config for time-series graphs: no toolbar, no double-click autoscale reset
+TIME_SERIES_GRAPH_CONFIG = {'displayModeBar': False, 'staticPlot': False, 'doubleClick': False}
+
+def _line_trace(x, y, **kwargs):
+    """WebGL line trace for time-series charts (use instead of go.Scatter)"""
+    return go.Scattergl(x=x, y=y, mode='lines', **kwargs)
+
+# Points kept in the portfolio growth chart: 24h of 30s slow ticks
+PERFORMANCE_MAX_POINTS = 2880
+
+def _performance_figure():
+    """Empty portfolio growth chart; update_performance_chart appends points to it"""
+    fig = go.Figure(data=[_line_trace([], [], name='Portfolio Value',
+                                      line=dict(color=COLORS['primary'], width=2))])
+    
+    fig.update_layout(
+        paper_bgcolor=COLORS['chart_bg'],
+        plot_bgcolor=COLORS['chart_bg'],
+        font={'color': COLORS['text']},
+        margin=dict(t=30, b=30, l=50, r=30),
+        xaxis=dict(gridcolor=COLORS['grid_color']),
+        yaxis=dict(gridcolor=COLORS['grid_color'], tickprefix='$'),
+        uirevision='keep'  # Keep the user's zoom/pan while points are appended
+    )
+    
+    return fig
+
+def _dominance_figure():
+    """Static dominance pie; update_dominance_chart only patches its values"""
+    fig = go.Figure(data=[go.Pie(
+        labels=['Bitcoin', 'Ethereum', 'Others'],
+        values=[0, 0, 100],
+        hole=0.4,
+        marker=dict(colors=[COLORS['warning'], COLORS['primary'], COLORS['muted']])
+    )])
+    
+    fig.update_layout(
+        title="Market Dominance",
+        paper_bgcolor=COLORS['chart_bg'],
+        plot_bgcolor=COLORS['chart_bg'],
+        font={'color': COLORS['text'], 'size': 10},
+        margin=dict(t=40, b=10, l=10, r=10),
+        showlegend=True,
+        legend=dict(orientation="h", yanchor="bottom", y=-0.2, xanchor="center", x=0.5)
+    )
+    
+    return fig
+
 # App Layout
 app.layout = dbc.Container([
-    dcc.Interval(id='interval-component', interval=30*1000, n_intervals=0),
     dcc.Interval(id='fast-interval', interval=5*1000, n_intervals=0),  # 5 second updates
+    dcc.Store(id='slow-tick'),  # Set client-side on every 6th fast tick (30s) to drive slow callbacks
     dcc.Store(id='price-history-store', data={}),
+    dcc.Store(id='portfolio-last'),  # Last values sent to this tab, so unchanged cards are skipped
+    dcc.Store(id='sentiment-last'),
+    dcc.Store(id='ticker-store'),  # Raw ticker prices; the ticker itself is rendered client-side
+    dcc.Store(id='ticker-colors', data={'up': COLORS['success'], 'down': COLORS['danger']}),
+    dcc.Store(id='portfolio-chart-labels'),  # Holdings drawn in the pie; values-only ticks Patch the figure
     
     # Header with Live Stats
     dbc.Row([
@@ -177,7 +277,7 @@ app.layout = dbc.Container([
                             dbc.Label("Coin ID", className="fw-bold"),
                             dcc.Dropdown(
                                 id="trade-coin-dropdown",
-                                options=[{'label': coin.title(), 'value': coin} for coin in Config.TOP_CRYPTOS],
+                                options=_COIN_OPTIONS,
                                 placeholder="Select cryptocurrency",
                                 className="mb-2",
                                 style={'color': '#000'}
@@ -228,7 +328,8 @@ app.layout = dbc.Container([
                                     html.Div(id="market-overview-content")
                                 ], width=6),
                                 dbc.Col([
-                                    dcc.Graph(id="market-dominance-chart", config={'displayModeBar': False},
+                                    dcc.Graph(id="market-dominance-chart", figure=_dominance_figure(),
+                                            config={'displayModeBar': False},
                                             style={'height': '250px'})
                                 ], width=6)
                             ])
@@ -275,7 +376,7 @@ app.layout = dbc.Container([
                                     dbc.Label("Select Cryptocurrency", className="fw-bold"),
                                     dcc.Dropdown(
                                         id='coin-selector',
-                                        options=[{'label': coin.title(), 'value': coin} for coin in Config.TOP_CRYPTOS],
+                                        options=_COIN_OPTIONS,
                                         value='bitcoin',
                                         className="mb-3",
                                         style={'color': '#000'}
@@ -338,7 +439,8 @@ app.layout = dbc.Container([
                     dbc.Card([
                         dbc.CardHeader(html.H5("📈 Portfolio Growth Chart", className="mb-0")),
                         dbc.CardBody([
-                            dcc.Graph(id="performance-chart", config={'displayModeBar': False})
+                            dcc.Graph(id="performance-chart", figure=_performance_figure(),
+                                    config=TIME_SERIES_GRAPH_CONFIG)
                         ])
                     ], style={'backgroundColor': COLORS['card_bg'], 'border': f'1px solid {COLORS["card_border"]}'})
                 ], width=12)
@@ -360,70 +462,59 @@ app.layout = dbc.Container([
 # Callbacks remain similar but I'll add the new ones for enhanced features...
 # (Keep all previous callbacks and add new ones below)
 
-@app.callback(
-    [Output("portfolio-value", "children"),
-     Output("portfolio-change", "children"),
-     Output("cash-balance", "children"),
-     Output("positions-count", "children"),
-     Output("total-return", "children"),
-     Output("return-percent", "children"),
-     Output("last-update-time", "children")],
-    [Input("interval-component", "n_intervals")]
+app.clientside_callback(
+    ClientsideFunction(namespace='ui', function_name='slow_tick'),
+    Output("slow-tick", "data"),
+    [Input("fast-interval", "n_intervals")]
 )
-def update_portfolio_stats(n):
-    if portfolio.positions:
-        coin_ids = list(portfolio.positions.keys())
-        live_prices = data_fetcher.get_live_prices(coin_ids)
+
+def _changed_only(rendered, keys, last):
+    """
+    Replace outputs whose key matches what this tab last received with no_update
+    
+    Args:
+        rendered: Output values, in Output order
+        keys: JSON-friendly comparison key for each output
+        last: Keys stored on the previous update (None on first load)
+    
+    Returns:
+        Output values with unchanged entries swapped for no_update
+    """
+    if not last:
+        return list(rendered)
+    return [no_update if key == old else value
+            for value, key, old in zip(rendered, keys, last)]
+
+
+def _portfolio_outputs(live_prices, last):
+    """Portfolio card outputs (changed values only) plus the keys to store"""
+    if live_prices:
         portfolio.update_prices(live_prices)
     
     performance = portfolio.get_portfolio_performance()
     
     return_color = COLORS['success'] if performance['total_return'] >= 0 else COLORS['danger']
     
-    return (
+    keys = [
         f"${performance['current_value']:,.2f}",
         f"Initial: ${performance['initial_balance']:,.2f}",
         f"${performance['cash_balance']:,.2f}",
         f"{performance['num_positions']} positions • {performance['num_trades']} trades",
-        html.Span(f"${performance['total_return']:,.2f}", style={'color': return_color}),
-        html.Span(f"{performance['return_percent']:+.2f}%", style={'color': return_color}),
-        datetime.now().strftime("%H:%M:%S")
-    )
-
-@app.callback(
-    Output("live-ticker", "children"),
-    [Input("fast-interval", "n_intervals")]
-)
-def update_live_ticker(n):
-    try:
-        top_coins = ['bitcoin', 'ethereum', 'binancecoin']
-        prices = data_fetcher.get_live_prices(top_coins)
-        
-        ticker_items = []
-        for coin_id in top_coins:
-            if coin_id in prices:
-                data = prices[coin_id]
-                change = data.get('change_24h', 0)
-                color = COLORS['success'] if change >= 0 else COLORS['danger']
-                ticker_items.append(
-                    html.Span([
-                        f"{coin_id.upper()}: ${data['price']:,.2f} ",
-                        html.Span(f"({change:+.2f}%)", style={'color': color})
-                    ], style={'marginRight': '20px'})
-                )
-        
-        return ticker_items
-    except:
-        return "Loading market data..."
+        [f"${performance['total_return']:,.2f}", return_color],
+        [f"{performance['return_percent']:+.2f}%", return_color]
+    ]
+    rendered = keys[:4] + [
+        html.Span(keys[4][0], style={'color': return_color}),
+        html.Span(keys[5][0], style={'color': return_color})
+    ]
+    
+    return (*_changed_only(rendered, keys, last), datetime.now().strftime("%H:%M:%S"),
+            no_update if keys == last else keys)
 
-@app.callback(
-    [Output("market-sentiment", "children"),
-     Output("market-cap-change", "children")],
-    [Input("interval-component", "n_intervals")]
-)
-def update_market_sentiment(n):
+def _sentiment_outputs(sentiment_future, last):
+    """Sentiment card outputs (changed values only) plus the keys to store"""
     try:
-        sentiment_data = trading_engine.get_market_sentiment()
+        sentiment_data = sentiment_future.result()
         sentiment = sentiment_data['sentiment']
         change = sentiment_data['market_cap_change_24h']
         
@@ -435,25 +526,95 @@ def update_market_sentiment(n):
             'Very Bearish': COLORS['danger']
         }
         
-        return (
+        keys = [sentiment, f"24h: {change:+.2f}%"]
+        rendered = [
             html.Span(sentiment, style={'color': sentiment_colors.get(sentiment, COLORS['primary'])}),
-            f"24h: {change:+.2f}%"
-        )
+            keys[1]
+        ]
+        return (*_changed_only(rendered, keys, last), no_update if keys == last else keys)
+    except:
+        return "Loading...", "...", None
+
+
+@app.callback(
+    [Output("portfolio-value", "children"),
+     Output("portfolio-change", "children"),
+     Output("cash-balance", "children"),
+     Output("positions-count", "children"),
+     Output("total-return", "children"),
+     Output("return-percent", "children"),
+     Output("last-update-time", "children"),
+     Output("portfolio-last", "data"),
+     Output("market-sentiment", "children"),
+     Output("market-cap-change", "children"),
+     Output("sentiment-last", "data")],
+    [Input("slow-tick", "data")],
+    [State("portfolio-last", "data"),
+     State("sentiment-last", "data")]
+)
+def update_portfolio_and_sentiment(n, portfolio_last, sentiment_last):
+    """Refresh the portfolio and sentiment cards, fetching prices and sentiment in parallel"""
+    # Sentiment fetches on the pool while prices fetch on this thread
+    sentiment_future = _pool.submit(get_market_sentiment_cached)
+    live_prices = None
+    if portfolio.positions:
+        live_prices = get_live_prices_cached(list(portfolio.positions))
+    
+    return _portfolio_outputs(live_prices, portfolio_last) + _sentiment_outputs(sentiment_future, sentiment_last)
+
+@app.callback(
+    Output("ticker-store", "data"),
+    [Input("fast-interval", "n_intervals")]
+)
+def update_live_ticker(n):
+    """Publish [symbol, price, 24h change] rows for the client-side ticker"""
+    try:
+        prices = get_live_prices_cached(TICKER_COINS)
+        
+        return [
+            [coin_id.upper(), prices[coin_id]['price'], prices[coin_id].get('change_24h', 0)]
+            for coin_id in TICKER_COINS
+            if coin_id in prices
+        ]
     except:
-        return "Loading...", "..."
+        return None
+
+
+app.clientside_callback(
+    ClientsideFunction(namespace='ui', function_name='render_ticker'),
+    Output("live-ticker", "children"),
+    [Input("ticker-store", "data")],
+    [State("ticker-colors", "data")]
+)
 
 # Continue with enhanced versions of other callbacks...
 # (I'll add the critical ones for the new features)
 
 @app.callback(
-    Output("portfolio-chart", "figure"),
-    [Input("interval-component", "n_intervals")]
+    [Output("portfolio-chart", "figure"),
+     Output("portfolio-chart-labels", "data")],
+    [Input("slow-tick", "data")],
+    [State("portfolio-chart-labels", "data")]
 )
-def update_portfolio_chart(n):
-    """Create portfolio allocation pie chart"""
-    positions = portfolio.get_positions_summary()
+def update_portfolio_chart(n, drawn_labels):
+    """
+    Create portfolio allocation pie chart
+    
+    The full figure is only sent when the set of holdings changes; otherwise
+    the existing pie gets a Patch with the new values.
+    """
+    symbols, current_values = portfolio.get_positions_summary_fast()
+    labels = symbols.tolist()
+    values = current_values.tolist()
+    
+    if drawn_labels is not None and labels == drawn_labels:
+        if not labels:
+            return no_update, no_update
+        patched = Patch()
+        patched['data'][0]['values'] = values
+        return patched, no_update
     
-    if not positions:
+    if not labels:
         # Empty portfolio
         fig = go.Figure()
         fig.add_annotation(
@@ -467,10 +628,7 @@ def update_portfolio_chart(n):
             plot_bgcolor=COLORS['chart_bg'],
             font={'color': COLORS['text']}
         )
-        return fig
-    
-    labels = [pos['symbol'] for pos in positions]
-    values = [pos['current_value'] for pos in positions]
+        return fig, labels
     
     fig = go.Figure(data=[go.Pie(
         labels=labels,
@@ -488,40 +646,39 @@ def update_portfolio_chart(n):
         legend=dict(orientation="h", yanchor="bottom", y=-0.2, xanchor="center", x=0.5)
     )
     
-    return fig
+    return fig, labels
 
 @app.callback(
     Output("market-dominance-chart", "figure"),
-    [Input("interval-component", "n_intervals")]
+    [Input("slow-tick", "data")]
 )
 def update_dominance_chart(n):
-    """Create market dominance chart"""
+    """Patch the market dominance pie values; labels and styling live in the layout"""
     try:
-        overview = data_fetcher.get_market_overview()
+        overview = get_market_overview_cached()
         btc_dom = overview.get('btc_dominance', 0)
         eth_dom = overview.get('eth_dominance', 0)
         other_dom = 100 - btc_dom - eth_dom
         
-        fig = go.Figure(data=[go.Pie(
-            labels=['Bitcoin', 'Ethereum', 'Others'],
-            values=[btc_dom, eth_dom, other_dom],
-            hole=0.4,
-            marker=dict(colors=[COLORS['warning'], COLORS['primary'], COLORS['muted']])
-        )])
-        
-        fig.update_layout(
-            title="Market Dominance",
-            paper_bgcolor=COLORS['chart_bg'],
-            plot_bgcolor=COLORS['chart_bg'],
-            font={'color': COLORS['text'], 'size': 10},
-            margin=dict(t=40, b=10, l=10, r=10),
-            showlegend=True,
-            legend=dict(orientation="h", yanchor="bottom", y=-0.2, xanchor="center", x=0.5)
-        )
-        
-        return fig
+        patched = Patch()
+        patched['data'][0]['values'] = [btc_dom, eth_dom, other_dom]
+        return patched
     except:
-        return go.Figure()
+        return no_update
+
+@app.callback(
+    Output("performance-chart", "extendData"),
+    [Input("slow-tick", "data")]
+)
+def update_performance_chart(n):
+    """Append the current portfolio value to the growth chart (this page session only)"""
+    # Trace 0 gets one point; the browser drops the oldest past PERFORMANCE_MAX_POINTS
+    return (
+        dict(x=[[datetime.now().isoformat(timespec='seconds')]],
+             y=[[round(portfolio.get_portfolio_value(), 2)]]),
+        [0],
+        PERFORMANCE_MAX_POINTS
+    )
 
 # Import all the previous callbacks here for suggestions, portfolio, trades, etc.
 # (Keeping them as they were but with enhanced styling)
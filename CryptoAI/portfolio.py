@@ -2,10 +2,12 @@
 Portfolio Management System
 Tracks portfolio, positions, and performance
 """
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
+from itertools import islice
 import json
 import os
+import numpy as np
 
 class Portfolio:
     def __init__(self, initial_balance: float = 1000):
@@ -15,6 +17,11 @@ class Portfolio:
         self.trade_history = []
         self.portfolio_file = 'portfolio_data.json'
         
+        # Parallel symbol/value arrays for charts, rebuilt only after a trade or price update
+        self._symbols_cache = np.empty(0, dtype=object)
+        self._values_cache = np.empty(0, dtype=np.float64)
+        self._summary_dirty = True
+        
         self._load_portfolio()
     
     def _load_portfolio(self):
@@ -84,6 +91,7 @@ class Portfolio:
             }
         
         self.cash_balance -= cost
+        self._summary_dirty = True
         
         # Record trade
         self.trade_history.append({
@@ -139,6 +147,7 @@ class Portfolio:
         else:
             # Reduce position
             self.positions[coin_id]['quantity'] -= quantity
+        self._summary_dirty = True
         
         self._save_portfolio()
         return True
@@ -151,6 +160,7 @@ class Portfolio:
             if coin_id in live_prices:
                 self.positions[coin_id]['current_price'] = live_prices[coin_id]['price']
                 self.positions[coin_id]['last_updated'] = datetime.now().isoformat()
+        self._summary_dirty = True
         
         self._save_portfolio()
     
@@ -228,11 +238,31 @@ class Portfolio:
         
         return summary
     
+    def get_positions_summary_fast(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get position symbols and current values as parallel arrays
+        
+        Returns:
+            (symbols, values) in position order; values are rounded to cents
+            like get_positions_summary(). Treat both arrays as read-only.
+        """
+        if self._summary_dirty:
+            positions = self.positions.values()
+            self._symbols_cache = np.array([pos['symbol'] for pos in positions], dtype=object)
+            self._values_cache = np.round(np.fromiter(
+                (pos['quantity'] * pos['current_price'] for pos in positions),
+                dtype=np.float64, count=len(self.positions)
+            ), 2)
+            self._summary_dirty = False
+        
+        return self._symbols_cache, self._values_cache
+    
     def get_trade_history(self, limit: int = 10) -> List[Dict]:
         """
         Get recent trade history
         """
-        return self.trade_history[-limit:][::-1]  # Most recent first
+        # Walk back from the newest trade; no slice/reverse copies of the list
+        return list(islice(reversed(self.trade_history), max(limit, 0)))
     
     def reset_portfolio(self):
         """
@@ -241,4 +271,5 @@ class Portfolio:
         self.cash_balance = self.initial_balance
         self.positions = {}
         self.trade_history = []
+        self._summary_dirty = True
         self._save_portfolio()
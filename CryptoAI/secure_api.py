@@ -9,10 +9,10 @@ from flask_limiter.util import get_remote_address
 import secrets
 from datetime import datetime
 from auth_system import (
-    AuthenticationManager,
-    AuthorizationManager,
     CORSManager,
     AuditLogger,
+    get_auth_manager,
+    get_authz_manager,
     require_auth,
     require_asset_access
 )
@@ -27,8 +27,8 @@ app.secret_key = secrets.token_hex(32)
 
 # Initialize security components
 cors_manager = CORSManager(app)
-auth_manager = AuthenticationManager()
-authz_manager = AuthorizationManager()
+auth_manager = get_auth_manager()
+authz_manager = get_authz_manager()
 audit_logger = AuditLogger()
 
 # Rate limiting
@@ -59,7 +59,7 @@ def setup_2fa():
         return jsonify({'error': 'Username required'}), 400
     
     try:
-        secret, qr_path = auth_manager.generate_2fa_secret(username)
+        secret, qr_png = auth_manager.generate_2fa_secret(username)
         
         audit_logger.log_event(
             event_type='2FA_SETUP',
@@ -71,7 +71,7 @@ def setup_2fa():
         return jsonify({
             'success': True,
             'secret': secret,
-            'qr_code_path': qr_path,
+            'qr_code': auth_manager.qr_data_uri(qr_png),
             'message': 'Scan QR code with your authenticator app'
         })
     except Exception as e:
@@ -171,6 +171,32 @@ def verify_token():
         'message': 'Token is valid'
     })
 
+@app.route('/api/auth/logout', methods=['POST'])
+@require_auth()
+def logout():
+    """End the caller's session"""
+    data = request.json or {}
+    session_id = data.get('session_id')
+    
+    session = auth_manager.verify_session(session_id) if session_id else None
+    if session and session['username'] == request.user['username']:
+        auth_manager.end_session(session_id)
+    
+    # Revoke the presented token too, in case it was not tied to a session
+    token = request.headers.get('Authorization', '')
+    if token.startswith('Bearer '):
+        token = token[7:]
+    auth_manager.revoke_jwt_token(token)
+    
+    audit_logger.log_event(
+        event_type='LOGOUT',
+        username=request.user['username'],
+        action='logout',
+        status='success'
+    )
+    
+    return jsonify({'success': True, 'message': 'Logged out'})
+
 # ============================================================================
 # PORTFOLIO ENDPOINTS (Authenticated)
 # ============================================================================
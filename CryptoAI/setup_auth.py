@@ -5,6 +5,7 @@ Initializes 2FA and biometric authentication for authorized users
 
 import os
 import json
+from datetime import datetime
 from pathlib import Path
 from auth_system import AuthenticationManager, AuthConfig
 from getpass import getpass
@@ -33,7 +34,12 @@ def setup_authentication():
         
         if response == 'y':
             try:
-                secret, qr_path = auth_manager.generate_2fa_secret(username)
+                secret, qr_png = auth_manager.generate_2fa_secret(username)
+                
+                # Keep a copy on disk so the code can be scanned from here
+                qr_path = Path(f'data/qr_codes/{username}_2fa.png')
+                qr_path.parent.mkdir(exist_ok=True)
+                qr_path.write_bytes(qr_png)
                 
                 # Save secret to user database
                 users = auth_manager._load_users()
@@ -41,7 +47,7 @@ def setup_authentication():
                     users[username] = {}
                 users[username]['2fa_secret'] = secret
                 users[username]['2fa_enabled'] = True
-                users[username]['2fa_setup_date'] = str(Path(qr_path).stat().st_mtime)
+                users[username]['2fa_setup_date'] = datetime.now().isoformat()
                 auth_manager._save_users(users)
                 
                 print(f"   ✅ 2FA Secret: {secret}")
@@ -0,0 +1,81 @@
+"""
+Unit tests for the streaming min/max scaler in advanced_ml_engine
+"""
+import importlib.util
+import unittest
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import MinMaxScaler
+
+HAS_TF = importlib.util.find_spec('tensorflow') is not None
+
+if HAS_TF:
+    from advanced_ml_engine import AdvancedMLEngine
+
+
+def _frame(start, values):
+    index = pd.date_range(start, periods=len(values), freq='h')
+    return np.asarray(values, dtype=np.float32), index
+
+
+@unittest.skipUnless(HAS_TF, 'tensorflow is not installed')
+class FitScalerTests(unittest.TestCase):
+    def setUp(self):
+        # Skip __init__: the scaler path needs none of the model setup
+        self.engine = AdvancedMLEngine.__new__(AdvancedMLEngine)
+        self.engine.scaler = MinMaxScaler(feature_range=(0, 1))
+        self.engine._running_min = None
+        self.engine._running_max = None
+        self.engine._last_seen = None
+
+    def assertMatchesSklearn(self, data, scaled):
+        reference = MinMaxScaler().fit(data)
+        np.testing.assert_allclose(scaled, reference.transform(data), rtol=1e-5, atol=1e-6)
+        np.testing.assert_allclose(self.engine.scaler.data_min_, reference.data_min_)
+        np.testing.assert_allclose(self.engine.scaler.data_max_, reference.data_max_)
+
+    def test_first_fit_matches_sklearn(self):
+        data, index = _frame('2024-01-01', [[100, 5], [110, 7], [90, 6]])
+        self.assertMatchesSklearn(data, self.engine._fit_scaler(data, index))
+        self.assertEqual(self.engine._last_seen, index[-1])
+
+    def test_appended_rows_widen_the_range(self):
+        data, index = _frame('2024-01-01', [[100, 5], [110, 7], [90, 6]])
+        self.engine._fit_scaler(data, index)
+
+        more, more_index = _frame('2024-01-01', [[100, 5], [110, 7], [90, 6], [120, 4]])
+        self.assertMatchesSklearn(more, self.engine._fit_scaler(more, more_index))
+
+    def test_rows_already_seen_are_ignored(self):
+        data, index = _frame('2024-01-01', [[100, 5], [110, 7], [90, 6]])
+        self.engine._fit_scaler(data, index)
+
+        # A rewritten old row must not move the range; only newer rows count
+        rewritten = data.copy()
+        rewritten[0] = [500, 50]
+        self.engine._fit_scaler(rewritten, index)
+        np.testing.assert_allclose(self.engine.scaler.data_max_, [110, 7])
+
+    def test_unchanged_range_keeps_fit(self):
+        data, index = _frame('2024-01-01', [[100, 5], [110, 7], [90, 6]])
+        self.engine._fit_scaler(data, index)
+        scale = self.engine.scaler.scale_
+
+        inside, inside_index = _frame('2024-01-01', [[100, 5], [110, 7], [90, 6], [95, 6]])
+        scaled = self.engine._fit_scaler(inside, inside_index)
+        self.assertIs(self.engine.scaler.scale_, scale)
+        self.assertEqual(self.engine._last_seen, inside_index[-1])
+        self.assertMatchesSklearn(inside, scaled)
+
+    def test_without_timestamps_rescans_history(self):
+        data, index = _frame('2024-01-01', [[100, 5], [110, 7], [90, 6]])
+        self.engine._fit_scaler(data, index)
+
+        shrunk = np.asarray([[95, 6], [105, 6.5]], dtype=np.float32)
+        self.assertMatchesSklearn(shrunk, self.engine._fit_scaler(shrunk))
+        self.assertIsNone(self.engine._last_seen)
+
+
+if __name__ == '__main__':
+    unittest.main()
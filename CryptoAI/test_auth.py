@@ -25,7 +25,7 @@ def test_2fa_setup():
         data = response.json()
         print(f"\n✅ 2FA Setup Successful!")
         print(f"   Secret: {data['secret']}")
-        print(f"   QR Code: {data['qr_code_path']}")
+        print(f"   QR Code: {data['qr_code'][:48]}... (data URI)")
         return data['secret']
     else:
         print(f"\n❌ 2FA Setup Failed: {response.json()}")
@@ -0,0 +1,303 @@
+"""
+Unit tests for auth_system (runs offline, in a temporary data directory)
+Run with: python -m unittest test_auth_system
+
+For the interactive end-to-end flow against a running API see test_auth.py
+"""
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import jwt
+import orjson
+import pyotp
+from flask import Flask, jsonify, request
+
+from auth_system import AuthConfig, AuthenticationManager, AuditLogger, CORSManager, require_auth
+
+
+class AuthTestCase(unittest.TestCase):
+    """Runs each test from an empty working directory (storage paths are relative)"""
+
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+        self.auth = AuthenticationManager()
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+
+class SessionStoreTests(AuthTestCase):
+    def test_session_round_trip(self):
+        session_id = self.auth.create_session('GBOSS101', 'tok', {'auth_method': 'standard'})
+        session = self.auth.verify_session(session_id)
+        self.assertEqual(session['username'], 'GBOSS101')
+        self.assertEqual(session['token'], 'tok')
+        self.assertEqual(session['metadata'], {'auth_method': 'standard'})
+        self.assertIsNone(self.auth.verify_session('unknown'))
+
+    def test_sessions_are_shared_between_managers(self):
+        # A second manager stands in for another server worker process
+        other_worker = AuthenticationManager()
+        session_id = self.auth.create_session('GBOSS101', 'tok')
+        self.assertEqual(other_worker.verify_session(session_id)['username'], 'GBOSS101')
+
+        self.assertTrue(other_worker.end_session(session_id))
+        self.assertIsNone(self.auth.verify_session(session_id))
+
+    def test_expired_session_is_rejected(self):
+        session_id = self.auth.create_session('GBOSS101', 'tok')
+        with self.auth._sessions_lock:
+            self.auth._sessions_db.execute(
+                'UPDATE sessions SET expires_at = ? WHERE id = ?', (time.time() - 1, session_id)
+            )
+        self.assertIsNone(self.auth.verify_session(session_id))
+
+    def test_legacy_session_files_are_imported_once(self):
+        now = time.time()
+        with open('data/sessions.json', 'wb') as f:
+            f.write(orjson.dumps({
+                'live': {'username': 'GBOSS101', 'token': 't1', 'created_at': now,
+                         'expires_at': now + 60, 'metadata': {}},
+                'expired': {'username': 'GBOSS101', 'token': 't2', 'created_at': now - 120,
+                            'expires_at': now - 60, 'metadata': {}}
+            }))
+        with open('data/sessions.jsonl', 'wb') as f:
+            f.write(orjson.dumps({'id': 'journaled', 'session': {
+                'username': 'johndawalka', 'token': 't3', 'created_at': now,
+                'expires_at': now + 60, 'metadata': {}}}) + b'\n')
+
+        auth = AuthenticationManager()
+        self.assertEqual(auth.verify_session('live')['token'], 't1')
+        self.assertEqual(auth.verify_session('journaled')['username'], 'johndawalka')
+        self.assertIsNone(auth.verify_session('expired'))
+        self.assertFalse(os.path.exists('data/sessions.json'))
+
+        auth.end_session('live')
+        self.assertIsNone(AuthenticationManager().verify_session('live'))
+
+
+class JWTTests(AuthTestCase):
+    def test_token_carries_compact_claims(self):
+        claims = jwt.decode(self.auth.generate_jwt_token('GBOSS101'), options={'verify_signature': False})
+        self.assertEqual(claims['u'], 'GBOSS101')
+        self.assertEqual(claims['p'], 1 | 2 | 4 | 8)
+        self.assertNotIn('permissions', claims)
+
+    def test_verify_expands_claims(self):
+        payload = self.auth.verify_jwt_token(self.auth.generate_jwt_token('johndawalka'))
+        self.assertEqual(payload['username'], 'johndawalka')
+        self.assertEqual(payload['github_username'], 'johndawalka')
+        self.assertEqual(payload['role'], 'admin')
+        self.assertEqual(payload['permissions'], ['read', 'write', 'trade', 'admin'])
+
+    def test_repeat_verify_is_served_from_cache(self):
+        token = self.auth.generate_jwt_token('GBOSS101')
+        with mock.patch('auth_system.jwt.decode', wraps=jwt.decode) as decode:
+            first = self.auth.verify_jwt_token(token)
+            second = self.auth.verify_jwt_token(token)
+        self.assertEqual(decode.call_count, 1)
+        self.assertEqual(first, second)
+
+    def test_cache_entry_past_exp_is_decoded_again(self):
+        token = self.auth.generate_jwt_token('GBOSS101')
+        self.auth.verify_jwt_token(token)
+        key = self.auth._jwt_cache_key(token)
+        payload, _ = self.auth._jwt_cache[key]
+        self.auth._jwt_cache[key] = (payload, time.time() - 1)
+
+        with mock.patch('auth_system.jwt.decode', wraps=jwt.decode) as decode:
+            self.assertIsNotNone(self.auth.verify_jwt_token(token))
+        self.assertEqual(decode.call_count, 1)
+
+    def test_cache_is_bounded_lru(self):
+        tokens = [self.auth.generate_jwt_token('GBOSS101', {'jti': str(i)}) for i in range(3)]
+        with mock.patch.object(AuthConfig, 'JWT_CACHE_SIZE', 2):
+            for token in tokens:
+                self.auth.verify_jwt_token(token)
+        self.assertEqual(len(self.auth._jwt_cache), 2)
+        self.assertNotIn(self.auth._jwt_cache_key(tokens[0]), self.auth._jwt_cache)
+
+    def test_invalid_tokens_are_rejected(self):
+        now = int(time.time())
+        expired = jwt.encode({'u': 'GBOSS101', 'p': 1, 'exp': now - 10, 'iat': now - 100,
+                              'iss': 'CryptoAI-Auth'}, AuthConfig.SECRET_KEY, algorithm='HS256')
+        forged = jwt.encode({'u': 'GBOSS101', 'p': 15, 'exp': now + 60, 'iss': 'CryptoAI-Auth'},
+                            'wrong-secret', algorithm='HS256')
+        unknown_user = jwt.encode({'u': 'mallory', 'p': 15, 'exp': now + 60, 'iss': 'CryptoAI-Auth'},
+                                  AuthConfig.SECRET_KEY, algorithm='HS256')
+        for token in (expired, forged, unknown_user, 'garbage'):
+            self.assertIsNone(self.auth.verify_jwt_token(token))
+
+    def test_require_auth_checks_permission_bits(self):
+        app = Flask(__name__)
+
+        @app.route('/trade')
+        @require_auth(permission='trade')
+        def trade():
+            return jsonify(user=request.user['username'])
+
+        client = app.test_client()
+        full = self.auth.generate_jwt_token('GBOSS101')
+        read_only = self.auth.generate_jwt_token('GBOSS101', {'p': AuthConfig.PERMISSION_BITS['read']})
+
+        with mock.patch('auth_system.get_auth_manager', return_value=self.auth):
+            self.assertEqual(client.get('/trade', headers={'Authorization': f'Bearer {full}'}).status_code, 200)
+            self.assertEqual(client.get('/trade', headers={'Authorization': f'Bearer {read_only}'}).status_code, 403)
+            self.assertEqual(client.get('/trade').status_code, 401)
+
+
+class TokenRevocationTests(AuthTestCase):
+    def test_logged_out_token_is_rejected(self):
+        token = self.auth.generate_jwt_token('GBOSS101')
+        self.assertIsNotNone(self.auth.verify_jwt_token(token))  # Now cached
+
+        self.auth.revoke_jwt_token(token)
+        self.assertIsNone(self.auth.verify_jwt_token(token))
+
+    def test_revocation_reaches_other_workers(self):
+        clock = [1000.0]
+        with mock.patch('auth_system.time.monotonic', side_effect=lambda: clock[0]):
+            other_worker = AuthenticationManager()
+            token = self.auth.generate_jwt_token('GBOSS101')
+            self.assertIsNotNone(other_worker.verify_jwt_token(token))
+
+            self.auth.revoke_jwt_token(token)
+            clock[0] += AuthConfig.REVOCATION_REFRESH_SECONDS
+            self.assertIsNone(other_worker.verify_jwt_token(token))
+
+    def test_cache_hit_does_not_query_sqlite(self):
+        token = self.auth.generate_jwt_token('GBOSS101')
+        self.auth.verify_jwt_token(token)
+
+        with mock.patch.object(self.auth, '_sessions_db') as db:
+            self.assertIsNotNone(self.auth.verify_jwt_token(token))
+        db.execute.assert_not_called()
+
+    def test_end_session_revokes_its_token(self):
+        token = self.auth.generate_jwt_token('johndawalka')
+        session_id = self.auth.create_session('johndawalka', token)
+
+        self.assertTrue(self.auth.end_session(session_id))
+        self.assertIsNone(self.auth.verify_jwt_token(token))
+        # Other tokens for the same user are unaffected
+        self.assertIsNotNone(self.auth.verify_jwt_token(
+            self.auth.generate_jwt_token('johndawalka', {'jti': 'second'})
+        ))
+
+    def test_revoking_a_forged_token_is_a_no_op(self):
+        self.auth.revoke_jwt_token('not.a.token')
+        with self.auth._sessions_lock:
+            count = self.auth._sessions_db.execute('SELECT COUNT(*) FROM revoked_tokens').fetchone()[0]
+        self.assertEqual(count, 0)
+
+
+class TotpThrottleTests(AuthTestCase):
+    def setUp(self):
+        super().setUp()
+        self.secret = pyotp.random_base32()
+        self.auth._save_users({'GBOSS101': {'2fa_secret': self.secret}})
+        self.clock = 1000.0
+        patcher = mock.patch('auth_system.time.monotonic', side_effect=lambda: self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _valid_code(self):
+        return pyotp.TOTP(self.secret).now()
+
+    def _fail(self, times):
+        for _ in range(times):
+            self.assertFalse(self.auth.verify_2fa_token('GBOSS101', '000000x'))
+
+    def test_lockout_after_max_failures(self):
+        self._fail(self.auth.config.TOTP_MAX_ATTEMPTS)
+        # Even the right code is refused during the lockout
+        self.assertFalse(self.auth.verify_2fa_token('GBOSS101', self._valid_code()))
+
+        self.clock += self.auth.config.TOTP_LOCKOUT_SECONDS
+        self.assertTrue(self.auth.verify_2fa_token('GBOSS101', self._valid_code()))
+
+    def test_lockout_spans_windows_and_doubles(self):
+        config = self.auth.config
+        self._fail(config.TOTP_MAX_ATTEMPTS)
+        self.clock += config.TOTP_LOCKOUT_SECONDS
+        self._fail(config.TOTP_MAX_ATTEMPTS)
+
+        # Second lockout is twice as long
+        self.clock += config.TOTP_LOCKOUT_SECONDS
+        self.assertFalse(self.auth.verify_2fa_token('GBOSS101', self._valid_code()))
+        self.clock += config.TOTP_LOCKOUT_SECONDS
+        self.assertTrue(self.auth.verify_2fa_token('GBOSS101', self._valid_code()))
+
+    def test_success_resets_the_failure_count(self):
+        self._fail(self.auth.config.TOTP_MAX_ATTEMPTS - 1)
+        self.assertTrue(self.auth.verify_2fa_token('GBOSS101', self._valid_code()))
+        self._fail(self.auth.config.TOTP_MAX_ATTEMPTS - 1)
+        self.assertTrue(self.auth.verify_2fa_token('GBOSS101', self._valid_code()))
+
+    def test_old_failures_stop_counting(self):
+        self._fail(self.auth.config.TOTP_MAX_ATTEMPTS - 1)
+        self.clock += self.auth.config.TOTP_FAILURE_RESET_SECONDS
+        self._fail(self.auth.config.TOTP_MAX_ATTEMPTS - 1)
+        self.assertTrue(self.auth.verify_2fa_token('GBOSS101', self._valid_code()))
+
+    def test_accounts_are_throttled_independently(self):
+        self._fail(self.auth.config.TOTP_MAX_ATTEMPTS)
+        self.assertTrue(self.auth._allow_totp_attempt('johndawalka'))
+
+
+class AuditLoggerTests(AuthTestCase):
+    def _logger(self):
+        logger = AuditLogger()
+        self.addCleanup(logger._fp.close)
+        return logger
+
+    def test_logging_does_not_read_the_log(self):
+        self._logger().log_event('LOGIN', 'GBOSS101', 'login', 'success')
+
+        logger = self._logger()
+        with mock.patch('auth_system.open', side_effect=AssertionError('log was read')):
+            logger.log_event('LOGOUT', 'GBOSS101', 'logout', 'success')
+        self.assertIsNone(logger._buf)
+
+    def test_read_returns_events_from_all_processes(self):
+        self._logger().log_event('LOGIN', 'GBOSS101', 'login', 'success')
+
+        logger = self._logger()
+        logger.log_event('LOGOUT', 'GBOSS101', 'logout', 'success')
+        self.assertEqual([e['event_type'] for e in logger._load_log()], ['LOGIN', 'LOGOUT'])
+
+        # Once loaded, new events go to the ring buffer as well as the file
+        logger.log_event('LOGIN', 'johndawalka', 'login', 'failure')
+        self.assertEqual(len(logger._load_log()), 3)
+        with open('data/audit_log.jsonl', 'rb') as f:
+            self.assertEqual(len(f.readlines()), 3)
+
+
+class CORSTests(unittest.TestCase):
+    def _allow_origin(self, origin):
+        app = Flask(__name__)
+        app.add_url_rule('/api/ping', 'ping', lambda: 'pong')
+        CORSManager(app)
+        response = app.test_client().get('/api/ping', headers={'Origin': origin})
+        return response.headers.get('Access-Control-Allow-Origin')
+
+    def test_only_listed_origins_are_allowed(self):
+        self.assertEqual(self._allow_origin('http://localhost:8050'), 'http://localhost:8050')
+        self.assertIsNone(self._allow_origin('http://localhost:80500'))
+        self.assertIsNone(self._allow_origin('https://evil.example'))
+
+    def test_origins_added_at_runtime_apply_to_new_apps(self):
+        origin = 'https://staging.cryptoai.app'
+        self.assertIsNone(self._allow_origin(origin))
+        with mock.patch.object(AuthConfig, 'ALLOWED_ORIGINS', AuthConfig.ALLOWED_ORIGINS + [origin]):
+            self.assertEqual(self._allow_origin(origin), origin)
+
+
+if __name__ == '__main__':
+    unittest.main()
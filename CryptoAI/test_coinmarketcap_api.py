@@ -0,0 +1,95 @@
+"""
+Unit tests for the CoinMarketCap API client (no network access needed)
+Run with: python -m unittest test_coinmarketcap_api
+"""
+import copy
+import pickle
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from coinmarketcap_api import CoinMarketCapAPI, Cryptocurrency
+
+
+def _sample_crypto():
+    return Cryptocurrency(
+        id=1, symbol='BTC', name='Bitcoin', current_price=65000.5,
+        market_cap=1.28e12, volume_24h=3.1e10, percent_change_1h=0.1,
+        percent_change_24h=-1.2, percent_change_7d=4.5,
+        last_updated=datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+    )
+
+
+class CryptocurrencyTests(unittest.TestCase):
+    def test_copy_round_trip(self):
+        crypto = _sample_crypto()
+        self.assertEqual(copy.copy(crypto), crypto)
+        self.assertEqual(copy.deepcopy(crypto), crypto)
+
+    def test_pickle_round_trip(self):
+        crypto = _sample_crypto()
+        for protocol in range(2, pickle.HIGHEST_PROTOCOL + 1):
+            restored = pickle.loads(pickle.dumps(crypto, protocol=protocol))
+            self.assertEqual(restored, crypto)
+
+    def test_still_frozen(self):
+        crypto = _sample_crypto()
+        with self.assertRaises(AttributeError):
+            crypto.current_price = 1.0
+
+    def test_from_cmc_response_fast_and_fallback_paths(self):
+        full = {
+            'id': 1, 'symbol': 'BTC', 'name': 'Bitcoin',
+            'last_updated': '2024-05-01T12:00:00.000Z',
+            'quote': {'USD': {
+                'price': 65000.5, 'market_cap': 1.28e12, 'volume_24h': 3.1e10,
+                'percent_change_1h': 0.1, 'percent_change_24h': -1.2,
+                'percent_change_7d': 4.5
+            }}
+        }
+        self.assertEqual(Cryptocurrency.from_cmc_response(full), _sample_crypto())
+
+        partial = Cryptocurrency.from_cmc_response({'id': 2, 'symbol': 'ETH', 'quote': {'USD': {'price': 3000}}})
+        self.assertEqual(partial.current_price, 3000)
+        self.assertEqual(partial.market_cap, 0.0)
+        self.assertEqual(partial.name, '')
+
+
+class PriceCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.api = CoinMarketCapAPI(api_key='test-key')
+        self.requested = []
+        self._lock = threading.Lock()
+
+        def fake_request(endpoint, params=None):
+            symbols = params['symbol'].split(',')
+            with self._lock:
+                self.requested.extend(symbols)
+            return {
+                sym: {'id': i, 'symbol': sym, 'name': sym, 'quote': {'USD': {'price': float(i)}}}
+                for i, sym in enumerate(symbols)
+            }
+
+        self.api._make_request = fake_request
+
+    def test_cached_symbols_are_not_refetched(self):
+        self.api.fetch_prices(['btc', 'eth'])
+        result = self.api.fetch_prices(['ETH', 'sol'])
+        self.assertEqual(set(result), {'ETH', 'SOL'})
+        self.assertEqual(sorted(self.requested), ['BTC', 'ETH', 'SOL'])
+
+    def test_concurrent_fetches_return_complete_results(self):
+        symbols = [f'C{i}' for i in range(250)]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _: self.api.fetch_prices(symbols), range(32)))
+        for result in results:
+            self.assertEqual(list(result), symbols)
+        # Everything is cached now, so another call makes no request
+        before = len(self.requested)
+        self.api.fetch_prices(symbols)
+        self.assertEqual(len(self.requested), before)
+
+
+if __name__ == '__main__':
+    unittest.main()
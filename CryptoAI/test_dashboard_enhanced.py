@@ -0,0 +1,47 @@
+"""
+Unit tests for dashboard_enhanced callback helpers
+"""
+import importlib.util
+import os
+import tempfile
+import unittest
+
+HAS_DASH = all(importlib.util.find_spec(name) is not None
+               for name in ('dash', 'dash_bootstrap_components', 'flask_caching', 'dotenv'))
+
+
+@unittest.skipUnless(HAS_DASH, 'dash and its dependencies are not installed')
+class ChangedOnlyTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Importing the module creates a portfolio file in the working directory
+        cls._cwd = os.getcwd()
+        cls._tmp = tempfile.TemporaryDirectory()
+        os.chdir(cls._tmp.name)
+        import dashboard_enhanced
+        cls.module = dashboard_enhanced
+
+    @classmethod
+    def tearDownClass(cls):
+        os.chdir(cls._cwd)
+        cls._tmp.cleanup()
+
+    def test_first_load_returns_everything(self):
+        rendered = ['a', 'b', 'c']
+        self.assertEqual(self.module._changed_only(rendered, [1, 2, 3], None), rendered)
+        self.assertEqual(self.module._changed_only(rendered, [1, 2, 3], []), rendered)
+
+    def test_unchanged_keys_become_no_update(self):
+        no_update = self.module.no_update
+        result = self.module._changed_only(['a', 'b', 'c'], [1, 2, 3], [1, 9, 3])
+        self.assertIs(result[0], no_update)
+        self.assertEqual(result[1], 'b')
+        self.assertIs(result[2], no_update)
+
+    def test_all_changed_returns_values(self):
+        result = self.module._changed_only(['a', 'b'], [[1], {'x': 2}], [[0], {'x': 3}])
+        self.assertEqual(result, ['a', 'b'])
+
+
+if __name__ == '__main__':
+    unittest.main()